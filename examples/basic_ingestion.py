@@ -151,6 +151,7 @@ def main():
     reconstructed = processor.reconstruct_url(
         row["scheme"], row["host"], row["path_query"]
     )
+    processor.close()
 
     print(f"Normalized & Reconstructed: {reconstructed}")
     print("\nComponents stored:")
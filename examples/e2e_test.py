@@ -117,6 +117,8 @@ def ingest_huggingface(
         print(f"\nError during ingestion: {e}")
         print("Make sure the dataset exists and you have access.")
         return False
+    finally:
+        processor.close()
 
 
 def ingest_local(dataset_name: str, file_path: Path):
@@ -208,6 +210,8 @@ def ingest_local(dataset_name: str, file_path: Path):
 
         traceback.print_exc()
         return False
+    finally:
+        processor.close()
 
 
 def build_indexes(incremental: bool = False):
@@ -248,17 +252,11 @@ def build_indexes(incremental: bool = False):
         print(f"  File registry: {current.files_tsv}")
 
         # Show index stats
-        import zstandard as zstd
-
-        from dataset_db.index import MembershipIndex
+        from dataset_db.index import DomainDictionary, MembershipIndex
 
         # Load domain dictionary
         dict_path = base_path / current.domains_txt
-        decompressor = zstd.ZstdDecompressor()
-        compressed_data = dict_path.read_bytes()
-        decompressed_data = decompressor.decompress(compressed_data)
-        domains_text = decompressed_data.decode("utf-8")
-        domains = [line for line in domains_text.split("\n") if line]
+        domains = DomainDictionary.load_domains(dict_path).to_pylist()
 
         print(f"\nDomains indexed: {len(domains):,}")
 
@@ -305,9 +303,7 @@ def test_queries():
         query_service = QueryService(loader)
 
         # Get sample domains
-        import zstandard as zstd
-
-        from dataset_db.index import Manifest
+        from dataset_db.index import DomainDictionary, Manifest
 
         manifest = Manifest(base_path)
         manifest.load()
@@ -315,11 +311,7 @@ def test_queries():
 
         # Load domains
         dict_path = base_path / current.domains_txt
-        decompressor = zstd.ZstdDecompressor()
-        compressed_data = dict_path.read_bytes()
-        decompressed_data = decompressor.decompress(compressed_data)
-        domains_text = decompressed_data.decode("utf-8")
-        domains = [line for line in domains_text.split("\n") if line]
+        domains = DomainDictionary.load_domains(dict_path).to_pylist()
 
         # Test with first few domains
         sample_domains = domains[:5]
@@ -430,7 +422,18 @@ def validate_implementation():
         manifest.load()
         current = manifest.get_current_version()
         print(f"   ✓ Found index version: {current.version}")
-        checks_passed += 1
+
+        from dataset_db.index import MembershipIndex
+
+        membership_path = (
+            base_path / "index" / current.version / "domain_to_datasets.roar"
+        )
+        try:
+            MembershipIndex(base_path).verify(membership_path)
+            print("   ✓ Membership index checksum OK")
+            checks_passed += 1
+        except (OSError, ValueError) as e:
+            print(f"   ✗ Membership index failed verification: {e}")
     else:
         print("   ✗ No index manifest found")
 
@@ -439,9 +442,8 @@ def validate_implementation():
     print("\n3. Checking query service...")
 
     try:
-        import zstandard as zstd
-
         from dataset_db.api import IndexLoader, QueryService
+        from dataset_db.index import DomainDictionary
 
         loader = IndexLoader(base_path)
         loader.load()
@@ -450,11 +452,7 @@ def validate_implementation():
 
         # Get a sample domain
         dict_path = base_path / current.domains_txt
-        decompressor = zstd.ZstdDecompressor()
-        compressed_data = dict_path.read_bytes()
-        decompressed_data = decompressor.decompress(compressed_data)
-        domains_text = decompressed_data.decode("utf-8")
-        domains = [line for line in domains_text.split("\n") if line]
+        domains = DomainDictionary.load_domains(dict_path).to_pylist()
 
         if len(domains) > 0:
             test_domain = domains[0]
@@ -183,6 +183,7 @@ def main():
 
     logger.info(f"Ingesting dataset 'documentation' with {len(df3)} URLs...")
     normalized3 = processor.process_batch(df3, "documentation")
+    processor.close()
     writer.write_batch(normalized3)
     writer.flush()
 
@@ -79,8 +79,7 @@ def inspect_indexes():
         print("Run index build: python examples/e2e_test.py --skip-ingestion")
         return False
 
-    from dataset_db.index import Manifest, MembershipIndex
-    import zstandard as zstd
+    from dataset_db.index import DomainDictionary, Manifest, MembershipIndex
 
     # Load manifest
     manifest = Manifest(base_path)
@@ -96,11 +95,7 @@ def inspect_indexes():
 
     # Load domain dictionary
     dict_path = base_path / current.domains_txt
-    decompressor = zstd.ZstdDecompressor()
-    compressed_data = dict_path.read_bytes()
-    decompressed_data = decompressor.decompress(compressed_data)
-    domains_text = decompressed_data.decode("utf-8")
-    domains = [line for line in domains_text.split("\n") if line]
+    domains = DomainDictionary.load_domains(dict_path).to_pylist()
 
     print("\nDomain Statistics:")
     print(f"  Total domains: {len(domains):,}")
@@ -50,6 +50,7 @@ def example_basic_write():
 
     # Process through normalization
     normalized_df = processor.process_batch(sample_data, "example_dataset")
+    processor.close()
 
     print(f"\nNormalized: {len(normalized_df)} records")
     print(normalized_df)
@@ -126,6 +127,8 @@ def example_multiple_datasets():
             f"({result['files_written']} files)"
         )
 
+    processor.close()
+
     # Flush any remaining buffered data
     flush_result = writer.flush()
     print(
@@ -303,6 +306,8 @@ def main():
         except Exception as e:
             print(f"Error loading dataset: {e}")
             print("Make sure the dataset exists and you have access.")
+        finally:
+            processor.close()
 
     else:
         # Run all examples
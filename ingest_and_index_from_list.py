@@ -283,6 +283,8 @@ def main() -> None:
         if ds_id is not None:
             ingested_ids.append(ds_id)
 
+    processor.close()
+
     if not ingested_ids:
         logger.error("No datasets were ingested successfully; skipping index build.")
         sys.exit(1)
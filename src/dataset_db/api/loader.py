@@ -9,8 +9,7 @@ import logging
 from functools import lru_cache
 from pathlib import Path
 
-import zstandard as zstd
-
+from dataset_db.index.domain_dict import DomainDictionary
 from dataset_db.index.file_registry import FileRegistry
 from dataset_db.index.manifest import IndexVersion, Manifest
 from dataset_db.index.membership import MembershipIndex
@@ -101,24 +100,12 @@ class IndexLoader:
         Load domain dictionary from compressed file.
 
         Args:
-            dict_path: Path to domains.txt.zst
+            dict_path: Path to domains.arrow (or legacy domains.txt.zst)
 
         Returns:
             List of domain strings (sorted)
         """
-        if not dict_path.exists():
-            raise FileNotFoundError(f"Domain dictionary not found: {dict_path}")
-
-        # Decompress
-        decompressor = zstd.ZstdDecompressor()
-        compressed_data = dict_path.read_bytes()
-        decompressed_data = decompressor.decompress(compressed_data)
-
-        # Parse
-        domains_text = decompressed_data.decode("utf-8")
-        domains = [line for line in domains_text.split("\n") if line]
-
-        return domains
+        return DomainDictionary.load_domains(dict_path).to_pylist()
 
     @property
     def domains(self) -> list[str]:
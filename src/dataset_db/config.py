@@ -24,7 +24,12 @@ class IngestionConfig(BaseSettings):
         description="Batch size for streaming from HuggingFace (rows per batch)",
     )
     max_workers: int = Field(
-        default=4, description="Number of parallel workers for processing"
+        default=1,
+        description=(
+            "Number of worker processes for URL normalization (1 disables). "
+            "Workers are spawned, so scripts that raise this need an "
+            "`if __name__ == '__main__':` guard."
+        ),
     )
 
     # Parquet settings
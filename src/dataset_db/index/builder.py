@@ -95,17 +95,13 @@ class IndexBuilder:
 
         # Step 4: Build membership index
         logger.info("Step 4/6: Building membership index...")
-        domain_lookup = {domain: idx for idx, domain in enumerate(domains)}
+        domain_lookup = dict(zip(domains, range(len(domains))))
         membership_path = self.base_path / "index" / version / "domain_to_datasets.roar"
-        self.membership.extract_memberships(domain_lookup)
-        self.membership.save(membership_path)
+        self.membership.extract_and_save(domain_lookup, membership_path)
 
         # Step 5: Build postings index
         logger.info("Step 5/6: Building postings index...")
-        file_lookup = {
-            info["parquet_rel_path"]: info["file_id"]
-            for info in self.file_registry.files
-        }
+        file_lookup = self.file_registry.path_to_id
         self.postings.extract_postings(domain_lookup, file_lookup)
         self.postings.save(version, compression_level=self.compression_level)
 
@@ -168,6 +164,13 @@ class IndexBuilder:
             prev_registry_path=prev_registry_path,
         )
 
+        # Read previous domains before the new dictionary is written (versions
+        # created within the same second share a directory)
+        try:
+            prev_domains = self.domain_dict.read_domain_dict(prev_version)
+        except FileNotFoundError:
+            prev_domains = []
+
         # Step 3: Build domain dictionary incrementally
         logger.info("Step 3/6: Building domain dictionary incrementally...")
         self.domain_dict.build_incremental(
@@ -175,22 +178,32 @@ class IndexBuilder:
             prev_version=prev_version,
             new_files=new_files,
             compression_level=self.compression_level,
+            old_domains=prev_domains,
         )
 
-        # Step 4: Build MPHF (full rebuild for now)
-        logger.info("Step 4/6: Building MPHF...")
+        # Step 4: Extend previous MPHF with appended domains
+        logger.info("Step 4/6: Building MPHF incrementally...")
         domains = self.domain_dict.read_domain_dict(version)
-        self.mphf.build(domains)
+        prev_mphf_path = self.base_path / prev_version_obj.domains_mphf
+        self.mphf = SimpleMPHF()
+        if prev_domains and prev_mphf_path.exists():
+            self.mphf.load(prev_mphf_path)
+            self.mphf.extend(domains, start_id=len(prev_domains))
+        else:
+            logger.warning(
+                f"Previous MPHF or domains unavailable for {prev_version}, "
+                "rebuilding MPHF from scratch"
+            )
+            self.mphf.build(domains)
         mphf_path = self.base_path / "index" / version / "domains.mphf"
         self.mphf.save(mphf_path, compression_level=self.compression_level)
 
         # Create domain lookup for downstream indexes
-        domain_lookup = {domain: idx for idx, domain in enumerate(domains)}
+        domain_lookup = dict(zip(domains, range(len(domains))))
 
         # Step 5: Build membership index incrementally
         logger.info("Step 5/6: Building membership index incrementally...")
         prev_membership_path = self.base_path / prev_version_obj.d2d_roar
-        prev_domains = self.domain_dict.read_domain_dict(prev_version)
         self.membership.build_incremental(
             domain_lookup=domain_lookup,
             version=version,
@@ -202,10 +215,7 @@ class IndexBuilder:
 
         # Step 6: Build postings index incrementally
         logger.info("Step 6/6: Building postings index incrementally...")
-        file_lookup = {
-            info["parquet_rel_path"]: info["file_id"]
-            for info in self.file_registry.files
-        }
+        file_lookup = self.file_registry.path_to_id
         self.postings.build_incremental(
             domain_lookup=domain_lookup,
             file_registry=file_lookup,
@@ -252,7 +262,7 @@ class IndexBuilder:
         try:
             registry_path = self.base_path / "index" / version / "files.tsv.zst"
             self.file_registry.load(registry_path)
-            stats["num_files"] = len(self.file_registry.files)
+            stats["num_files"] = len(self.file_registry)
         except Exception as e:
             logger.error(f"Error reading file registry: {e}")
             stats["num_files"] = 0
@@ -263,9 +273,7 @@ class IndexBuilder:
                 self.base_path / "index" / version / "domain_to_datasets.roar"
             )
             self.membership.load(membership_path, stats.get("num_domains", 0))
-            stats["num_domain_dataset_pairs"] = sum(
-                len(bm) for bm in self.membership.domain_bitmaps.values()
-            )
+            stats["num_domain_dataset_pairs"] = self.membership.total_dataset_refs()
         except Exception as e:
             logger.error(f"Error reading membership index: {e}")
             stats["num_domain_dataset_pairs"] = 0
@@ -2,16 +2,23 @@
 Domain dictionary builder and reader.
 
 Extracts unique domains from Parquet files, sorts them, and creates:
-- domains.txt.zst: sorted unique domains, newline-delimited, zstd compressed
+- domains.arrow: Arrow IPC file with a single large_utf8 "domain" column,
+  zstd-compressed buffers
 - Supports forward lookup (string → id) and reverse lookup (id → string)
+
+Versions written before the Arrow format used domains.txt.zst (newline-delimited,
+zstd compressed); these are still readable.
 """
 
 import logging
+import mmap
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Iterator
 
 import polars as pl
+import pyarrow as pa
 import zstandard as zstd
+from pyarrow import ipc
 
 from ..storage.layout import StorageLayout
 
@@ -26,6 +33,13 @@ class DomainDictionary:
     The ID is simply the index in the sorted list of unique domains.
     """
 
+    FILENAME = "domains.arrow"
+    LEGACY_FILENAME = "domains.txt.zst"
+    SCHEMA = pa.schema([pa.field("domain", pa.large_utf8(), nullable=False)])
+
+    # Minimum number of buffered per-file unique values before merging
+    MERGE_MIN_ROWS = 1_000_000
+
     def __init__(self, base_path: Path):
         """
         Initialize domain dictionary builder.
@@ -72,36 +86,69 @@ class DomainDictionary:
 
         logger.info(f"Found {len(parquet_files)} Parquet files to scan")
 
-        # Extract unique domains using Polars
-        unique_domains = set()
+        # Sort domains for consistent ordering
+        sorted_domains = self._collect_domains(parquet_files)
+        logger.info(f"Extracted {len(sorted_domains)} unique domains")
+
+        return sorted_domains
+
+    def _collect_domains(self, parquet_files: list[Path]) -> list[str]:
+        """
+        Collect the sorted unique domains across Parquet files.
+
+        Deduplication runs in Polars: per-file unique values are buffered and
+        periodically merged into a running unique Series, so domains seen in
+        earlier files never become Python strings.
+
+        Args:
+            parquet_files: Parquet files to scan
+
+        Returns:
+            Sorted list of unique domain strings
+        """
+        unique_domains = pl.Series("domain", [], dtype=pl.Utf8)
+        pending: list[pl.Series] = []
+        pending_rows = 0
 
         for i, parquet_file in enumerate(parquet_files, 1):
             if i % 100 == 0:
                 logger.info(
                     f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(unique_domains)} unique domains so far"
+                    f"~{len(unique_domains) + pending_rows} unique domains so far"
                 )
 
             try:
-                # Read only the domain column
-                df = pl.read_parquet(parquet_file, columns=["domain"])
-                domains = df["domain"].unique().to_list()
-                unique_domains.update(domains)
+                # Read only the domain column and drop the full column as soon
+                # as it is deduplicated
+                file_domains = pl.read_parquet(
+                    parquet_file, columns=["domain"]
+                ).to_series()
+                file_unique = file_domains.unique()
+                del file_domains
             except Exception as e:
                 logger.error(f"Error reading {parquet_file}: {e}")
                 continue
 
-        # Sort domains for consistent ordering
-        sorted_domains = sorted(unique_domains)
-        logger.info(f"Extracted {len(sorted_domains)} unique domains")
+            pending.append(file_unique)
+            pending_rows += len(file_unique)
 
-        return sorted_domains
+            # Merge once the buffer is as large as the running set, which keeps
+            # the total merge cost linear in the number of values read
+            if pending_rows >= max(self.MERGE_MIN_ROWS, len(unique_domains)):
+                unique_domains = pl.concat([unique_domains, *pending]).unique()
+                pending = []
+                pending_rows = 0
+
+        unique_domains = (
+            pl.concat([unique_domains, *pending]).drop_nulls().unique().sort()
+        )
+        return unique_domains.to_list()
 
     def write_domain_dict(
         self, domains: list[str], version: str, compression_level: int = 6
     ) -> Path:
         """
-        Write domain dictionary to compressed file.
+        Write domain dictionary to an Arrow IPC file with zstd compression.
 
         Args:
             domains: Sorted list of unique domains
@@ -115,27 +162,26 @@ class DomainDictionary:
         index_dir = self.base_path / "index" / version
         index_dir.mkdir(parents=True, exist_ok=True)
 
-        output_path = index_dir / "domains.txt.zst"
+        output_path = index_dir / self.FILENAME
 
         logger.info(
             f"Writing {len(domains)} domains to {output_path} "
             f"(compression level {compression_level})"
         )
 
-        # Compress and write
-        compressor = zstd.ZstdCompressor(level=compression_level)
+        # Build a single-column record batch (no intermediate joined string)
+        domain_array = pa.array(domains, type=pa.large_utf8())
+        batch = pa.record_batch([domain_array], schema=self.SCHEMA)
 
-        # Join domains with newlines
-        domains_text = "\n".join(domains) + "\n"  # Add trailing newline
-        domains_bytes = domains_text.encode("utf-8")
-
-        compressed_data = compressor.compress(domains_bytes)
-
-        output_path.write_bytes(compressed_data)
+        options = ipc.IpcWriteOptions(
+            compression=pa.Codec("zstd", compression_level=compression_level)
+        )
+        with ipc.new_file(str(output_path), self.SCHEMA, options=options) as writer:
+            writer.write_batch(batch)
 
         # Log statistics
-        original_size = len(domains_bytes)
-        compressed_size = len(compressed_data)
+        original_size = domain_array.nbytes
+        compressed_size = output_path.stat().st_size
         ratio = original_size / compressed_size if compressed_size > 0 else 0
 
         logger.info(
@@ -145,36 +191,111 @@ class DomainDictionary:
 
         return output_path
 
-    def read_domain_dict(self, version: str) -> list[str]:
+    @classmethod
+    def load_domains(cls, dict_path: Path) -> pa.LargeStringArray:
         """
-        Read domain dictionary from compressed file.
+        Load a domain dictionary file as an Arrow array.
+
+        Reads the Arrow IPC format, falling back to the legacy newline-delimited
+        format for files named domains.txt.zst.
 
         Args:
-            version: Version identifier
+            dict_path: Path to domains.arrow (or legacy domains.txt.zst)
 
         Returns:
-            List of domain strings (sorted)
+            Arrow large_utf8 array of domains (index = domain_id)
         """
-        dict_path = self.base_path / "index" / version / "domains.txt.zst"
-
+        dict_path = Path(dict_path)
         if not dict_path.exists():
             raise FileNotFoundError(f"Domain dictionary not found: {dict_path}")
 
-        logger.info(f"Reading domain dictionary from {dict_path}")
+        if dict_path.name == cls.LEGACY_FILENAME:
+            domains_text = cls._decompress_mapped(dict_path).decode("utf-8")
+            domains = [line for line in domains_text.split("\n") if line]
+            return pa.array(domains, type=pa.large_utf8())
 
-        # Decompress
+        # Memory-map so the kernel pages in compressed buffers on demand
+        with pa.memory_map(str(dict_path), "r") as source:
+            table = ipc.open_file(source).read_all()
+
+        column = table.column("domain")
+        if column.num_chunks == 0:
+            return pa.array([], type=pa.large_utf8())
+        return column.combine_chunks()
+
+    @staticmethod
+    def _decompress_mapped(path: Path) -> bytes:
+        """
+        Decompress a zstd file through a read-only memory map.
+
+        Avoids holding a second full copy of the compressed input in memory.
+
+        Args:
+            path: Path to zstd-compressed file
+
+        Returns:
+            Decompressed bytes
+        """
         decompressor = zstd.ZstdDecompressor()
-        compressed_data = dict_path.read_bytes()
-        decompressed_data = decompressor.decompress(compressed_data)
+        with (
+            path.open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            if zstd.frame_content_size(mm) != -1:
+                return decompressor.decompress(mm)
+
+            # Output size not recorded in the frame header: stream it
+            with decompressor.stream_reader(mm) as reader:
+                return reader.read()
+
+    def get_dict_path(self, version: str) -> Path:
+        """
+        Get the domain dictionary path for a version.
 
-        # Parse
-        domains_text = decompressed_data.decode("utf-8")
-        domains = [line for line in domains_text.split("\n") if line]
+        Args:
+            version: Version identifier
+
+        Returns:
+            Path to domains.arrow, or to the legacy domains.txt.zst if only the
+            legacy file exists for this version
+        """
+        index_dir = self.base_path / "index" / version
+        dict_path = index_dir / self.FILENAME
+        legacy_path = index_dir / self.LEGACY_FILENAME
+        if not dict_path.exists() and legacy_path.exists():
+            return legacy_path
+        return dict_path
+
+    def read_domain_array(self, version: str) -> pa.LargeStringArray:
+        """
+        Read domain dictionary as an Arrow array.
+
+        Args:
+            version: Version identifier
 
+        Returns:
+            Arrow large_utf8 array of domains (sorted)
+        """
+        dict_path = self.get_dict_path(version)
+
+        logger.info(f"Reading domain dictionary from {dict_path}")
+        domains = self.load_domains(dict_path)
         logger.info(f"Loaded {len(domains)} domains")
 
         return domains
 
+    def read_domain_dict(self, version: str) -> list[str]:
+        """
+        Read domain dictionary from compressed file.
+
+        Args:
+            version: Version identifier
+
+        Returns:
+            List of domain strings (sorted)
+        """
+        return self.read_domain_array(version).to_pylist()
+
     def iter_domains(self, version: str) -> Iterator[tuple[int, str]]:
         """
         Iterate over domains with their IDs.
@@ -221,25 +342,7 @@ class DomainDictionary:
         """
         logger.info(f"Extracting domains from {len(parquet_files)} Parquet files...")
 
-        unique_domains = set()
-
-        for i, parquet_file in enumerate(parquet_files, 1):
-            if i % 100 == 0:
-                logger.info(
-                    f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(unique_domains)} unique domains so far"
-                )
-
-            try:
-                # Read only the domain column
-                df = pl.read_parquet(parquet_file, columns=["domain"])
-                domains = df["domain"].unique().to_list()
-                unique_domains.update(domains)
-            except Exception as e:
-                logger.error(f"Error reading {parquet_file}: {e}")
-                continue
-
-        sorted_domains = sorted(unique_domains)
+        sorted_domains = self._collect_domains(parquet_files)
         logger.info(f"Extracted {len(sorted_domains)} unique domains from new files")
 
         return sorted_domains
@@ -255,8 +358,9 @@ class DomainDictionary:
         the end in sorted order.
 
         Args:
-            old_domains: Sorted list of existing domains
-            new_domains: Sorted list of new domains
+            old_domains: Existing domains in domain_id order
+            new_domains: Sorted list of new domains (e.g. from
+                extract_domains_from_files)
 
         Returns:
             Merged list with old domains first, then new unique domains appended
@@ -268,8 +372,9 @@ class DomainDictionary:
         # Convert old domains to set for O(1) lookup
         old_domain_set = set(old_domains)
 
-        # Find truly new domains (not in old set)
-        truly_new = sorted([d for d in new_domains if d not in old_domain_set])
+        # Find truly new domains (not in old set); filtering preserves the
+        # sorted order of new_domains, so no re-sort is needed
+        truly_new = [d for d in new_domains if d not in old_domain_set]
 
         # Append new domains to preserve old domain IDs
         merged = old_domains + truly_new
@@ -287,6 +392,7 @@ class DomainDictionary:
         prev_version: str | None,
         new_files: list[Path],
         compression_level: int = 6,
+        old_domains: list[str] | None = None,
     ) -> Path:
         """
         Build domain dictionary incrementally by merging with previous version.
@@ -296,23 +402,28 @@ class DomainDictionary:
             prev_version: Previous version identifier (None for first build)
             new_files: List of new Parquet files to process
             compression_level: Zstd compression level
+            old_domains: Domains of prev_version, if the caller already read
+                them (skips reading the previous dictionary again)
 
         Returns:
             Path to the written domain dictionary file
         """
         logger.info("Building domain dictionary incrementally...")
 
-        # Load previous domains if available
-        old_domains = []
-        if prev_version:
-            try:
-                old_domains = self.read_domain_dict(prev_version)
-                logger.info(f"Loaded {len(old_domains)} domains from previous version")
-            except FileNotFoundError:
-                logger.warning(
-                    f"Previous domain dictionary not found for version {prev_version}, "
-                    "starting from scratch"
-                )
+        # Load previous domains if available (and not passed in)
+        if old_domains is None:
+            old_domains = []
+            if prev_version:
+                try:
+                    old_domains = self.read_domain_dict(prev_version)
+                    logger.info(
+                        f"Loaded {len(old_domains)} domains from previous version"
+                    )
+                except FileNotFoundError:
+                    logger.warning(
+                        f"Previous domain dictionary not found for version "
+                        f"{prev_version}, starting from scratch"
+                    )
 
         # Extract domains from new files only
         new_domains = self.extract_domains_from_files(new_files)
@@ -7,8 +7,17 @@ file_id \t dataset_id \t domain_prefix \t parquet_rel_path
 
 import io
 import logging
+import mmap
+import os
+import re
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import IO, ClassVar
 
+import numpy as np
 import polars as pl
 import zstandard as zstd
 
@@ -16,12 +25,213 @@ from ..storage.layout import StorageLayout
 
 logger = logging.getLogger(__name__)
 
+# Directory mtimes newer than this (relative to the scan) are not recorded,
+# since files written in the same timestamp tick would go unnoticed
+_MTIME_SLACK_NS = 2_000_000_000
+
+# Hive-style partition directories: dataset_id={id}/domain_prefix={hh}/
+_PARTS_RE = re.compile(r"(?:^|[\\/])dataset_id=(\d+)[\\/]domain_prefix=([^\\/]+)[\\/]")
+
+
+def _sorted_entries(root: str) -> list[os.DirEntry]:
+    """List a directory's non-symlink entries, sorted by name."""
+    with os.scandir(root) as entries:
+        return sorted(
+            (entry for entry in entries if not entry.is_symlink()),
+            key=lambda entry: entry.name,
+        )
+
+
+def _is_parquet_file(entry: os.DirEntry) -> bool:
+    """Check whether a directory entry is a regular *.parquet file."""
+    return entry.name.endswith(".parquet") and entry.is_file(follow_symlinks=False)
+
+
+def _scandir_parquet(
+    root: str,
+    root_mtime: int | None = None,
+    leaf_mtimes: dict[str, int] | None = None,
+    prev_leaf_mtimes: dict[str, int] | None = None,
+) -> Iterator[str]:
+    """
+    Recursively yield paths of Parquet files under a directory.
+
+    Uses os.scandir so file/dir checks come from the directory listing instead
+    of a stat() per entry. Symlinks are skipped. Each directory's entries are
+    visited in name order, so the output order is deterministic without a
+    sort over full path strings.
+
+    When leaf_mtimes is given, the mtime of every directory without
+    subdirectories is recorded there, and leaf directories whose mtime matches
+    prev_leaf_mtimes are skipped without being listed (no files were added or
+    removed since they were recorded).
+
+    Args:
+        root: Directory to walk
+        root_mtime: mtime (ns) of root, taken before listing it
+        leaf_mtimes: Output map of leaf directory path → mtime (ns)
+        prev_leaf_mtimes: Leaf directory mtimes recorded by a previous scan
+
+    Yields:
+        Paths (as strings) of *.parquet files
+    """
+    has_subdirs = False
+    for entry in _sorted_entries(root):
+        if entry.is_dir(follow_symlinks=False):
+            has_subdirs = True
+            mtime = None
+            if leaf_mtimes is not None:
+                mtime = entry.stat(follow_symlinks=False).st_mtime_ns
+                if prev_leaf_mtimes and prev_leaf_mtimes.get(entry.path) == mtime:
+                    leaf_mtimes[entry.path] = mtime
+                    continue
+            yield from _scandir_parquet(
+                entry.path, mtime, leaf_mtimes, prev_leaf_mtimes
+            )
+        elif _is_parquet_file(entry):
+            yield entry.path
+
+    # Only record mtimes old enough that a same-tick write can't be missed
+    if (
+        leaf_mtimes is not None
+        and root_mtime is not None
+        and not has_subdirs
+        and root_mtime < time.time_ns() - _MTIME_SLACK_NS
+    ):
+        leaf_mtimes[root] = root_mtime
+
+
+def _list_parquet_files(
+    root: str,
+    leaf_mtimes: dict[str, int] | None = None,
+    prev_leaf_mtimes: dict[str, int] | None = None,
+) -> list[str]:
+    """
+    Collect Parquet file paths under a directory.
+
+    Top-level subdirectories (dataset_id=... partitions) are independent, so
+    they are walked on a thread pool; scandir releases the GIL during
+    directory reads.
+
+    Args:
+        root: Directory to walk
+        leaf_mtimes: Output map of leaf directory path → mtime (ns)
+        prev_leaf_mtimes: Leaf directory mtimes recorded by a previous scan
+
+    Returns:
+        Paths (as strings) of *.parquet files, in the same order as
+        _scandir_parquet
+    """
+    entries = _sorted_entries(root)
+    subdirs = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+
+    walked: dict[str, list[str]] = {}
+    if len(subdirs) >= 2:
+        # One level down, so each worker only walks its own partition
+        max_workers = min(32, (os.cpu_count() or 1) * 4, len(subdirs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            walked = dict(
+                zip(
+                    subdirs,
+                    executor.map(
+                        lambda path: list(
+                            _scandir_parquet(path, None, leaf_mtimes, prev_leaf_mtimes)
+                        ),
+                        subdirs,
+                    ),
+                )
+            )
+
+    files: list[str] = []
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if entry.path in walked:
+                files.extend(walked[entry.path])
+            else:
+                files.extend(
+                    _scandir_parquet(entry.path, None, leaf_mtimes, prev_leaf_mtimes)
+                )
+        elif _is_parquet_file(entry):
+            files.append(entry.path)
+    return files
+
+
+def _relative_path(path: str, root: str) -> str:
+    """
+    Strip the root directory prefix from a path under it.
+
+    Slicing avoids the Path parsing and allocation done by Path.relative_to.
+    Separators are normalized to "/" so stored paths stay portable.
+
+    Args:
+        path: Path of a file under root
+        root: Root directory path, without trailing separator
+
+    Returns:
+        Path relative to root
+    """
+    rel_path = path[len(root) + 1 :]
+    if os.sep != "/":
+        rel_path = rel_path.replace(os.sep, "/")
+    return rel_path
+
+
+class _CountingWriter(io.RawIOBase):
+    """Binary writer that forwards to another writer and counts bytes."""
+
+    def __init__(self, raw: IO[bytes]):
+        self._raw = raw
+        self.bytes_written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._raw.write(data)
+        size = memoryview(data).nbytes
+        self.bytes_written += size
+        return size
+
+
+def _parse_path(rel_path: str) -> tuple[int, str] | None:
+    """
+    Parse dataset_id and domain_prefix from a Parquet path.
+
+    Args:
+        rel_path: Path relative to urls/
+            (e.g., "dataset_id=1/domain_prefix=ab/part-00000.parquet")
+
+    Returns:
+        (dataset_id, domain_prefix), or None if the path is not partitioned.
+        The prefix is interned: there are few distinct prefixes across many files.
+    """
+    m = _PARTS_RE.search(rel_path)
+    if m is None:
+        return None
+    return int(m.group(1)), sys.intern(m.group(2))
+
 
 class FileRegistry:
     """
     Manage file ID to Parquet path mappings.
+
+    Entries are stored column-wise (struct of arrays): file_ids[i],
+    dataset_ids[i], domain_prefixes[i] and parquet_rel_paths[i] describe one file.
     """
 
+    # TSV column types; explicit so polars never infers them (prefixes like
+    # "00" or "1e" must stay strings)
+    SCHEMA: ClassVar[dict[str, pl.DataType]] = {
+        "file_id": pl.Int64,
+        "dataset_id": pl.Int32,
+        "domain_prefix": pl.Utf8,
+        "parquet_rel_path": pl.Utf8,
+    }
+
+    # Sidecar next to the registry with leaf partition directory mtimes, used
+    # to skip unchanged partitions on incremental scans
+    DIR_MTIMES_FILENAME = "dirs.tsv.zst"
+
     def __init__(self, base_path: Path):
         """
         Initialize file registry.
@@ -31,8 +241,105 @@ class FileRegistry:
         """
         self.base_path = Path(base_path)
         self.layout = StorageLayout(base_path)
-        self.files: list[dict[str, str | int]] = []
+        self.file_ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self.dataset_ids: np.ndarray = np.empty(0, dtype=np.int32)
+        self.domain_prefixes: list[str] = []
+        self.parquet_rel_paths: list[str] = []
         self.path_to_id: dict[str, int] = {}
+        self.dir_mtimes: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Number of registered files."""
+        return len(self.file_ids)
+
+    @property
+    def files(self) -> list[dict[str, str | int]]:
+        """
+        Registry entries as a list of dicts.
+
+        Built on demand from the column arrays; prefer the arrays (or
+        get_file_info) on hot paths.
+        """
+        return [
+            {
+                "file_id": file_id,
+                "dataset_id": dataset_id,
+                "domain_prefix": domain_prefix,
+                "parquet_rel_path": rel_path,
+            }
+            for file_id, dataset_id, domain_prefix, rel_path in zip(
+                self.file_ids.tolist(),
+                self.dataset_ids.tolist(),
+                self.domain_prefixes,
+                self.parquet_rel_paths,
+            )
+        ]
+
+    def _set_columns(
+        self,
+        file_ids: list[int] | np.ndarray,
+        dataset_ids: list[int] | np.ndarray,
+        domain_prefixes: list[str],
+        parquet_rel_paths: list[str],
+    ) -> None:
+        """Replace registry contents and rebuild the reverse lookup."""
+        self.file_ids = np.asarray(file_ids, dtype=np.int64)
+        self.dataset_ids = np.asarray(dataset_ids, dtype=np.int32)
+        self.domain_prefixes = domain_prefixes
+        self.parquet_rel_paths = parquet_rel_paths
+        self.path_to_id = dict(zip(parquet_rel_paths, self.file_ids.tolist()))
+
+    def _append_columns(
+        self,
+        file_ids: list[int],
+        dataset_ids: list[int],
+        domain_prefixes: list[str],
+        parquet_rel_paths: list[str],
+    ) -> None:
+        """Append entries in place, updating the reverse lookup for them only."""
+        self.file_ids = np.concatenate(
+            [self.file_ids, np.asarray(file_ids, dtype=np.int64)]
+        )
+        self.dataset_ids = np.concatenate(
+            [self.dataset_ids, np.asarray(dataset_ids, dtype=np.int32)]
+        )
+        self.domain_prefixes.extend(domain_prefixes)
+        self.parquet_rel_paths.extend(parquet_rel_paths)
+        self.path_to_id.update(zip(parquet_rel_paths, file_ids))
+
+    def _scan(
+        self, root: str, prev_dir_mtimes: dict[str, int] | None = None
+    ) -> tuple[list[str], dict[str, int]]:
+        """
+        Walk urls/ for Parquet files, recording leaf directory mtimes.
+
+        Args:
+            root: urls/ directory path
+            prev_dir_mtimes: Directory mtimes from a previous scan (relative
+                paths); unchanged directories are skipped
+
+        Returns:
+            (Parquet file paths, leaf directory mtimes keyed by relative path)
+        """
+        prev_leaf_mtimes = {
+            os.path.join(root, rel_dir): mtime
+            for rel_dir, mtime in (prev_dir_mtimes or {}).items()
+        }
+        leaf_mtimes: dict[str, int] = {}
+        parquet_files = _list_parquet_files(root, leaf_mtimes, prev_leaf_mtimes)
+
+        dir_mtimes = {
+            _relative_path(path, root): mtime for path, mtime in leaf_mtimes.items()
+        }
+        num_skipped = sum(
+            1
+            for path, mtime in leaf_mtimes.items()
+            if prev_leaf_mtimes.get(path) == mtime
+        )
+        if num_skipped:
+            logger.info(f"Skipped {num_skipped} unchanged partition directories")
+
+        return parquet_files, dir_mtimes
 
     def scan_parquet_files(self) -> None:
         """
@@ -45,48 +352,49 @@ class FileRegistry:
             logger.warning(f"URLs directory does not exist: {urls_dir}")
             return
 
-        parquet_files = sorted(urls_dir.rglob("*.parquet"))
+        root = str(urls_dir)
+        parquet_files, self.dir_mtimes = self._scan(root)
         if not parquet_files:
             logger.warning("No Parquet files found")
             return
 
         logger.info(f"Found {len(parquet_files)} Parquet files")
 
-        for file_id, parquet_file in enumerate(parquet_files):
-            # Parse dataset_id and domain_prefix from path
-            parts = parquet_file.parts
+        file_ids: list[int] = []
+        dataset_ids: list[int] = []
+        domain_prefixes: list[str] = []
+        rel_paths: list[str] = []
 
-            dataset_id = None
-            domain_prefix = None
-
-            for part in parts:
-                if part.startswith("dataset_id="):
-                    dataset_id = int(part.split("=")[1])
-                elif part.startswith("domain_prefix="):
-                    domain_prefix = part.split("=")[1]
+        num_unparsed = 0
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        for file_id, parquet_file in enumerate(parquet_files):
+            # Get relative path from urls/ directory
+            rel_path = _relative_path(parquet_file, root)
 
-            if dataset_id is None or domain_prefix is None:
-                logger.warning(
-                    f"Could not extract dataset_id/domain_prefix from {parquet_file}"
-                )
+            # Parse dataset_id and domain_prefix from path
+            parsed = _parse_path(rel_path)
+            if parsed is None:
+                num_unparsed += 1
+                if debug_enabled:
+                    logger.debug("Unpartitioned Parquet file: %s", parquet_file)
                 continue
-
-            # Get relative path from urls/ directory
-            rel_path = str(parquet_file.relative_to(urls_dir))
+            dataset_id, domain_prefix = parsed
 
             # Add to registry
-            self.files.append(
-                {
-                    "file_id": file_id,
-                    "dataset_id": dataset_id,
-                    "domain_prefix": domain_prefix,
-                    "parquet_rel_path": rel_path,
-                }
+            file_ids.append(file_id)
+            dataset_ids.append(dataset_id)
+            domain_prefixes.append(domain_prefix)
+            rel_paths.append(rel_path)
+
+        if num_unparsed:
+            logger.warning(
+                f"Skipped {num_unparsed} Parquet files without "
+                "dataset_id/domain_prefix partitions"
             )
 
-            self.path_to_id[rel_path] = file_id
+        self._set_columns(file_ids, dataset_ids, domain_prefixes, rel_paths)
 
-        logger.info(f"Registered {len(self.files)} Parquet files")
+        logger.info(f"Registered {len(self)} Parquet files")
 
     def save(self, output_path: Path, compression_level: int = 6) -> None:
         """
@@ -98,37 +406,98 @@ class FileRegistry:
         """
         logger.info(f"Saving file registry to {output_path}...")
 
-        if not self.files:
+        if len(self) == 0:
             logger.warning("No files in registry")
             return
 
-        # Convert to DataFrame
-        df = pl.DataFrame(self.files)
-
-        # Write to TSV via StringIO buffer
-        buffer = io.StringIO()
-        df.write_csv(file=buffer, separator="\t")
-        tsv_bytes = buffer.getvalue().encode("utf-8")
-
-        # Compress
-        compressor = zstd.ZstdCompressor(level=compression_level)
-        compressed_data = compressor.compress(tsv_bytes)
+        # Convert to DataFrame directly from the columns
+        df = pl.DataFrame(
+            {
+                "file_id": self.file_ids,
+                "dataset_id": self.dataset_ids,
+                "domain_prefix": self.domain_prefixes,
+                "parquet_rel_path": self.parquet_rel_paths,
+            },
+            schema=self.SCHEMA,
+        )
 
-        # Write
+        # Stream TSV bytes through the zstd compressor straight to disk; polars
+        # hands the writer encoded chunks, so no text buffer or re-encode is needed
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(compressed_data)
+        compressor = zstd.ZstdCompressor(level=compression_level)
+        with (
+            output_path.open("wb") as f,
+            compressor.stream_writer(f, closefd=False) as zstd_writer,
+        ):
+            counting_writer = _CountingWriter(zstd_writer)
+            df.write_csv(file=counting_writer, separator="\t")
 
         # Log statistics
-        original_size = len(tsv_bytes)
-        compressed_size = len(compressed_data)
+        original_size = counting_writer.bytes_written
+        compressed_size = output_path.stat().st_size
         ratio = original_size / compressed_size if compressed_size > 0 else 0
 
         logger.info(
-            f"Saved file registry: {len(self.files)} files, "
+            f"Saved file registry: {len(self)} files, "
             f"{original_size:,} bytes → {compressed_size:,} bytes "
             f"(compression ratio: {ratio:.2f}x)"
         )
 
+        self._save_dir_mtimes(output_path, compression_level)
+
+    def _save_dir_mtimes(self, registry_path: Path, compression_level: int) -> None:
+        """
+        Save leaf directory mtimes to the sidecar next to a registry file.
+
+        Args:
+            registry_path: Path of the saved registry
+            compression_level: Zstd compression level
+        """
+        sidecar_path = registry_path.with_name(self.DIR_MTIMES_FILENAME)
+        if not self.dir_mtimes:
+            # A stale sidecar must not describe a registry it wasn't built with
+            sidecar_path.unlink(missing_ok=True)
+            return
+
+        df = pl.DataFrame(
+            {
+                "dir_rel_path": list(self.dir_mtimes.keys()),
+                "mtime_ns": list(self.dir_mtimes.values()),
+            },
+            schema={"dir_rel_path": pl.Utf8, "mtime_ns": pl.Int64},
+        )
+        buffer = io.BytesIO()
+        df.write_csv(buffer, separator="\t")
+        compressor = zstd.ZstdCompressor(level=compression_level)
+        sidecar_path.write_bytes(compressor.compress(buffer.getbuffer()))
+
+    @classmethod
+    def _load_dir_mtimes(cls, registry_path: Path) -> dict[str, int]:
+        """
+        Load leaf directory mtimes saved next to a registry file.
+
+        Args:
+            registry_path: Path of the saved registry
+
+        Returns:
+            Map of directory path (relative to urls/) → mtime (ns); empty if
+            the registry has no sidecar
+        """
+        sidecar_path = registry_path.with_name(cls.DIR_MTIMES_FILENAME)
+        if not sidecar_path.exists():
+            return {}
+
+        df = cls._read_tsv(
+            sidecar_path,
+            schema_overrides={"dir_rel_path": pl.Utf8, "mtime_ns": pl.Int64},
+        )
+        return dict(
+            zip(
+                df.get_column("dir_rel_path").to_list(),
+                df.get_column("mtime_ns").to_list(),
+            )
+        )
+
     def load(self, input_path: Path) -> None:
         """
         Load file registry from TSV.
@@ -141,23 +510,70 @@ class FileRegistry:
         if not input_path.exists():
             raise FileNotFoundError(f"File registry not found: {input_path}")
 
-        # Decompress
+        df = self._read_tsv(input_path, schema_overrides=self.SCHEMA)
+
+        self._set_columns(
+            df.get_column("file_id").to_numpy(),
+            df.get_column("dataset_id").to_numpy(),
+            list(map(sys.intern, df.get_column("domain_prefix").to_list())),
+            df.get_column("parquet_rel_path").to_list(),
+        )
+        self.dir_mtimes = self._load_dir_mtimes(input_path)
+
+        logger.info(f"Loaded file registry: {len(self)} files")
+
+    @staticmethod
+    def _read_tsv(input_path: Path, **read_csv_kwargs) -> pl.DataFrame:
+        """
+        Decompress a registry file through a memory map and parse the TSV.
+
+        Frames that record their content size (e.g. registries written in one
+        shot) are decompressed into a single pre-sized buffer; streamed frames
+        from save() carry no size and are fed to polars through a reader.
+
+        Args:
+            input_path: Path to registry file
+            **read_csv_kwargs: Extra arguments for pl.read_csv
+
+        Returns:
+            Parsed registry DataFrame
+        """
         decompressor = zstd.ZstdDecompressor()
-        compressed_data = input_path.read_bytes()
-        tsv_bytes = decompressor.decompress(compressed_data)
+        with (
+            input_path.open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            if zstd.frame_content_size(mm) != -1:
+                tsv_bytes = decompressor.decompress(mm)
+                return pl.read_csv(tsv_bytes, separator="\t", **read_csv_kwargs)
+
+            with decompressor.stream_reader(mm) as reader:
+                return pl.read_csv(reader, separator="\t", **read_csv_kwargs)
+
+    @staticmethod
+    def load_paths_only(input_path: Path) -> set[str]:
+        """
+        Load only the relative Parquet paths from a saved registry.
 
-        # Parse TSV
-        df = pl.read_csv(tsv_bytes, separator="\t")
+        Skips parsing the ID and prefix columns and building the registry
+        arrays, for callers that only need membership checks.
 
-        # Convert to list of dicts
-        self.files = df.to_dicts()
+        Args:
+            input_path: Path to registry file
 
-        # Build reverse lookup
-        self.path_to_id = {
-            row["parquet_rel_path"]: row["file_id"] for row in self.files
-        }
+        Returns:
+            Set of relative Parquet paths
+        """
+        if not input_path.exists():
+            raise FileNotFoundError(f"File registry not found: {input_path}")
+
+        df = FileRegistry._read_tsv(
+            input_path,
+            columns=["parquet_rel_path"],
+            schema_overrides={"parquet_rel_path": pl.Utf8},
+        )
 
-        logger.info(f"Loaded file registry: {len(self.files)} files")
+        return set(df.get_column("parquet_rel_path").to_list())
 
     def get_file_path(self, file_id: int) -> str | None:
         """
@@ -169,9 +585,9 @@ class FileRegistry:
         Returns:
             Relative path to Parquet file, or None if not found
         """
-        if file_id < 0 or file_id >= len(self.files):
+        if file_id < 0 or file_id >= len(self):
             return None
-        return self.files[file_id]["parquet_rel_path"]
+        return self.parquet_rel_paths[file_id]
 
     def get_file_info(self, file_id: int) -> dict[str, str | int] | None:
         """
@@ -183,9 +599,14 @@ class FileRegistry:
         Returns:
             Dict with file_id, dataset_id, domain_prefix, parquet_rel_path
         """
-        if file_id < 0 or file_id >= len(self.files):
+        if file_id < 0 or file_id >= len(self):
             return None
-        return self.files[file_id]
+        return {
+            "file_id": int(self.file_ids[file_id]),
+            "dataset_id": int(self.dataset_ids[file_id]),
+            "domain_prefix": self.domain_prefixes[file_id],
+            "parquet_rel_path": self.parquet_rel_paths[file_id],
+        }
 
     def get_file_id(self, rel_path: str) -> int | None:
         """
@@ -234,22 +655,26 @@ class FileRegistry:
         logger.info("Building file registry incrementally...")
 
         # Load previous registry if provided
-        existing_files = []
+        num_existing = 0
         next_file_id = 0
 
         if prev_registry_path and prev_registry_path.exists():
             logger.info(f"Loading previous registry from {prev_registry_path}")
             self.load(prev_registry_path)
-            existing_files = self.files.copy()
+            num_existing = len(self)
 
-            # Find max file_id to start numbering new files
-            if existing_files:
-                next_file_id = max(f["file_id"] for f in existing_files) + 1
+            # File IDs are assigned in increasing order (and saved in that
+            # order), so the last entry holds the max file_id
+            if num_existing:
+                next_file_id = int(self.file_ids[-1]) + 1
 
             logger.info(
-                f"Loaded {len(existing_files)} existing files, "
+                f"Loaded {num_existing} existing files, "
                 f"next file_id will be {next_file_id}"
             )
+        else:
+            self._set_columns([], [], [], [])
+            self.dir_mtimes = {}
 
         # Scan all Parquet files
         urls_dir = self.base_path / "urls"
@@ -257,57 +682,53 @@ class FileRegistry:
             logger.warning(f"URLs directory does not exist: {urls_dir}")
             return base_path / "index" / version / "files.tsv.zst"
 
-        all_parquet_files = sorted(urls_dir.rglob("*.parquet"))
-        logger.info(f"Found {len(all_parquet_files)} total Parquet files")
+        root = str(urls_dir)
+        all_parquet_files, self.dir_mtimes = self._scan(root, self.dir_mtimes)
+        logger.info(f"Found {len(all_parquet_files)} Parquet files to check")
 
         # Determine which files are new
-        existing_paths = {f["parquet_rel_path"] for f in existing_files}
-        new_files = []
-
+        existing_paths = self.path_to_id
+        new_file_ids: list[int] = []
+        new_dataset_ids: list[int] = []
+        new_domain_prefixes: list[str] = []
+        new_rel_paths: list[str] = []
+
+        num_unparsed = 0
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
         for parquet_file in all_parquet_files:
-            rel_path = str(parquet_file.relative_to(urls_dir))
+            rel_path = _relative_path(parquet_file, root)
 
             if rel_path in existing_paths:
                 continue  # Already registered
 
             # Parse dataset_id and domain_prefix from path
-            parts = parquet_file.parts
-
-            dataset_id = None
-            domain_prefix = None
-
-            for part in parts:
-                if part.startswith("dataset_id="):
-                    dataset_id = int(part.split("=")[1])
-                elif part.startswith("domain_prefix="):
-                    domain_prefix = part.split("=")[1]
-
-            if dataset_id is None or domain_prefix is None:
-                logger.warning(
-                    f"Could not extract dataset_id/domain_prefix from {parquet_file}"
-                )
+            parsed = _parse_path(rel_path)
+            if parsed is None:
+                num_unparsed += 1
+                if debug_enabled:
+                    logger.debug("Unpartitioned Parquet file: %s", parquet_file)
                 continue
+            dataset_id, domain_prefix = parsed
 
             # Add to new files list
-            new_files.append(
-                {
-                    "file_id": next_file_id,
-                    "dataset_id": dataset_id,
-                    "domain_prefix": domain_prefix,
-                    "parquet_rel_path": rel_path,
-                }
-            )
+            new_file_ids.append(next_file_id)
+            new_dataset_ids.append(dataset_id)
+            new_domain_prefixes.append(domain_prefix)
+            new_rel_paths.append(rel_path)
             next_file_id += 1
 
-        logger.info(f"Found {len(new_files)} new files to register")
+        if num_unparsed:
+            logger.warning(
+                f"Skipped {num_unparsed} Parquet files without "
+                "dataset_id/domain_prefix partitions"
+            )
 
-        # Merge existing + new files
-        self.files = existing_files + new_files
+        logger.info(f"Found {len(new_file_ids)} new files to register")
 
-        # Rebuild reverse lookup
-        self.path_to_id = {
-            row["parquet_rel_path"]: row["file_id"] for row in self.files
-        }
+        # Append new files to the loaded registry
+        self._append_columns(
+            new_file_ids, new_dataset_ids, new_domain_prefixes, new_rel_paths
+        )
 
         # Save merged registry
         output_path = base_path / "index" / version / "files.tsv.zst"
@@ -315,7 +736,7 @@ class FileRegistry:
 
         logger.info(
             f"Built incremental file registry: "
-            f"{len(existing_files)} existing + {len(new_files)} new = {len(self.files)} total"
+            f"{num_existing} existing + {len(new_file_ids)} new = {len(self)} total"
         )
 
         return output_path
@@ -335,11 +756,11 @@ class FileRegistry:
         logger.info("Determining new files since previous version...")
 
         # Load previous registry
-        existing_paths = set()
+        existing_paths: set[str] = set()
+        prev_dir_mtimes: dict[str, int] = {}
         if prev_registry_path and prev_registry_path.exists():
-            prev_registry = FileRegistry(self.base_path)
-            prev_registry.load(prev_registry_path)
-            existing_paths = {f["parquet_rel_path"] for f in prev_registry.files}
+            existing_paths = self.load_paths_only(prev_registry_path)
+            prev_dir_mtimes = self._load_dir_mtimes(prev_registry_path)
             logger.info(f"Previous version had {len(existing_paths)} files")
 
         # Scan all current Parquet files
@@ -348,15 +769,16 @@ class FileRegistry:
             logger.warning(f"URLs directory does not exist: {urls_dir}")
             return []
 
-        all_parquet_files = list(urls_dir.rglob("*.parquet"))
-        logger.info(f"Current version has {len(all_parquet_files)} files")
+        root = str(urls_dir)
+        all_parquet_files, _ = self._scan(root, prev_dir_mtimes)
+        logger.info(f"Found {len(all_parquet_files)} Parquet files to check")
 
         # Filter to only new files
         new_files = []
         for parquet_file in all_parquet_files:
-            rel_path = str(parquet_file.relative_to(urls_dir))
+            rel_path = _relative_path(parquet_file, root)
             if rel_path not in existing_paths:
-                new_files.append(parquet_file)
+                new_files.append(Path(parquet_file))
 
         logger.info(f"Found {len(new_files)} new files")
 
@@ -7,11 +7,32 @@ atomic updates.
 
 import json
 import logging
-from datetime import datetime, timezone
+import os
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def _iso_to_epoch_us(timestamp: str) -> int:
+    """
+    Convert an ISO-8601 timestamp to microseconds since the Unix epoch.
+
+    Naive timestamps are treated as UTC.
+
+    Args:
+        timestamp: ISO-8601 timestamp (e.g., "2025-10-24T12:00:00+00:00")
+
+    Returns:
+        Microseconds since 1970-01-01T00:00:00Z
+    """
+    dt = datetime.fromisoformat(timestamp)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return (dt - _EPOCH) // timedelta(microseconds=1)
+
 
 class IndexVersion:
     """
@@ -34,7 +55,7 @@ class IndexVersion:
 
         Args:
             version: Version identifier (e.g., "2025-10-24T12:00:00Z")
-            domains_txt: Path to domains.txt.zst
+            domains_txt: Path to the domain dictionary (domains.arrow)
             domains_mphf: Path to domains.mphf
             d2d_roar: Path to domain_to_datasets.roar
             postings_base: Base path pattern for postings (e.g., "index/2025-10-24/postings/{shard}/postings.{idx,dat}.zst")
@@ -49,7 +70,9 @@ class IndexVersion:
         self.postings_base = postings_base
         self.files_tsv = files_tsv
         self.parquet_root = parquet_root
-        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+        self.created_at = created_at or datetime.now(UTC).isoformat()
+        # Parsed once so sorting by creation time compares ints, not strings
+        self.created_at_us = _iso_to_epoch_us(self.created_at)
 
     def to_dict(self) -> dict[str, str]:
         """Convert to dictionary for JSON serialization."""
@@ -94,7 +117,22 @@ class Manifest:
         self.base_path = Path(base_path)
         self.manifest_path = self.base_path / "index" / "manifest.json"
         self.current_version: str | None = None
-        self.versions: list[IndexVersion] = []
+        # Version id → IndexVersion, or the raw dict from manifest.json until
+        # the version is first looked up (insertion-ordered)
+        self._by_id: dict[str, IndexVersion | dict[str, str]] = {}
+
+    @property
+    def versions(self) -> list[IndexVersion]:
+        """All versions, in manifest order (materializes every entry)."""
+        return [self._materialize(version_id) for version_id in self._by_id]
+
+    def _materialize(self, version_id: str) -> IndexVersion:
+        """Convert a raw manifest entry to an IndexVersion on first use."""
+        entry = self._by_id[version_id]
+        if isinstance(entry, dict):
+            entry = IndexVersion.from_dict(entry)
+            self._by_id[version_id] = entry
+        return entry
 
     def load(self) -> None:
         """Load manifest from disk."""
@@ -104,15 +142,14 @@ class Manifest:
 
         logger.info(f"Loading manifest from {self.manifest_path}")
 
-        with open(self.manifest_path) as f:
-            data = json.load(f)
+        data = json.loads(self.manifest_path.read_bytes())
 
         self.current_version = data.get("current_version")
-        self.versions = [IndexVersion.from_dict(v) for v in data.get("versions", [])]
+        self._by_id = {v["version"]: v for v in data.get("versions", [])}
 
         logger.info(
             f"Loaded manifest: current_version={self.current_version}, "
-            f"{len(self.versions)} versions"
+            f"{len(self._by_id)} versions"
         )
 
     def save(self) -> None:
@@ -121,7 +158,10 @@ class Manifest:
 
         data = {
             "current_version": self.current_version,
-            "versions": [v.to_dict() for v in self.versions],
+            "versions": [
+                v.to_dict() if isinstance(v, IndexVersion) else v
+                for v in self._by_id.values()
+            ],
         }
 
         # Write to temporary file first
@@ -129,12 +169,22 @@ class Manifest:
         temp_path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(temp_path, "w") as f:
-            json.dump(data, f, indent=2)
+            f.write(json.dumps(data, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
 
-        # Atomic rename
-        temp_path.rename(self.manifest_path)
+        # Atomic rename (os.replace also overwrites on Windows)
+        os.replace(temp_path, self.manifest_path)
 
-        logger.info(f"Saved manifest: {len(self.versions)} versions")
+        # Persist the rename itself (directories can't be opened on Windows)
+        if os.name == "posix":
+            dir_fd = os.open(self.manifest_path.parent, os.O_RDONLY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+        logger.info(f"Saved manifest: {len(self._by_id)} versions")
 
     def add_version(self, version: IndexVersion) -> None:
         """
@@ -144,12 +194,12 @@ class Manifest:
             version: Index version to add
         """
         # Check if version already exists
-        existing = self.get_version(version.version)
-        if existing:
+        if version.version in self._by_id:
             logger.warning(f"Version {version.version} already exists, replacing")
-            self.versions = [v for v in self.versions if v.version != version.version]
+            # Re-added versions move to the end, as a new entry would
+            del self._by_id[version.version]
 
-        self.versions.append(version)
+        self._by_id[version.version] = version
         logger.info(f"Added version {version.version} to manifest")
 
     def set_current_version(self, version: str) -> None:
@@ -178,10 +228,9 @@ class Manifest:
         Returns:
             IndexVersion if found, None otherwise
         """
-        for v in self.versions:
-            if v.version == version:
-                return v
-        return None
+        if version not in self._by_id:
+            return None
+        return self._materialize(version)
 
     def get_current_version(self) -> IndexVersion | None:
         """
@@ -201,7 +250,7 @@ class Manifest:
         Returns:
             List of version identifiers, sorted by creation time
         """
-        return [v.version for v in sorted(self.versions, key=lambda x: x.created_at)]
+        return [v.version for v in sorted(self.versions, key=lambda x: x.created_at_us)]
 
     def create_version_from_build(
         self, version: str, num_shards: int = 1024
@@ -218,7 +267,7 @@ class Manifest:
         """
         return IndexVersion(
             version=version,
-            domains_txt=f"index/{version}/domains.txt.zst",
+            domains_txt=f"index/{version}/domains.arrow",
             domains_mphf=f"index/{version}/domains.mphf",
             d2d_roar=f"index/{version}/domain_to_datasets.roar",
             postings_base=f"index/{version}/postings/{{shard:04d}}/postings.{{idx,dat}}.zst",
@@ -259,13 +308,13 @@ class Manifest:
         Returns:
             List of removed version identifiers
         """
-        if len(self.versions) <= keep_last_n:
-            logger.info(f"Only {len(self.versions)} versions, nothing to clean up")
+        if len(self._by_id) <= keep_last_n:
+            logger.info(f"Only {len(self._by_id)} versions, nothing to clean up")
             return []
 
         # Sort by creation time
         sorted_versions = sorted(
-            self.versions, key=lambda x: x.created_at, reverse=True
+            self.versions, key=lambda x: x.created_at_us, reverse=True
         )
 
         # Keep the last N
@@ -274,7 +323,7 @@ class Manifest:
 
         # Remove from manifest
         removed_ids = [v.version for v in to_remove]
-        self.versions = to_keep
+        self._by_id = {v.version: v for v in to_keep}
 
         logger.info(f"Removed {len(removed_ids)} old versions: {removed_ids}")
 
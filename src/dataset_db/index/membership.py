@@ -4,31 +4,332 @@ Domain → Datasets membership index using Roaring bitmaps.
 Builds a compact index mapping each domain to the set of datasets containing it.
 Format follows spec.md §2.2B:
 
-[magic=DTDR][ver=1][N_domains:uint64][index_offset:uint64]
+[magic=DTDR][ver=2][N_domains:uint64][index_offset:uint64]
 [bitmaps... concatenated]
 [index: N_domains entries of {bitmap_start:uint64, bitmap_len:uint32}]
+[crc32:uint32]
 """
 
 import logging
+import mmap
+import os
+import re
 import struct
+import zlib
+from collections import deque
+from collections.abc import Iterable, Iterator, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import pairwise
 from pathlib import Path
 
+import numpy as np
 import polars as pl
+import pyarrow.parquet as pq
 from pyroaring import BitMap
 
 from ..storage.layout import StorageLayout
+from .file_registry import _list_parquet_files
 
 logger = logging.getLogger(__name__)
 
+# (domain, dataset_id) pairs read from Parquet files
+_PAIRS_SCHEMA = {"domain": pl.Utf8, "dataset_id": pl.Int64}
+
+# dataset_id={id} path component
+_DATASET_ID_RE = re.compile(r"(?:^|/)dataset_id=(\d+)(?:/|$)")
+
+
+def _read_file_domains(parquet_file: str | Path) -> tuple[int | None, list[str]]:
+    """
+    Read the dataset_id and unique domains of one Parquet file.
+
+    Args:
+        parquet_file: Path to a dataset_id=N/domain_prefix=XX/part-*.parquet file
+
+    Returns:
+        (dataset_id, unique domains); dataset_id is None (and no data is read)
+        if the path has no dataset_id= partition
+    """
+    match = _DATASET_ID_RE.search(os.fspath(parquet_file).replace(os.sep, "/"))
+    if match is None:
+        return None, []
+
+    df = pl.read_parquet(parquet_file, columns=["domain"])
+    return int(match.group(1)), df["domain"].unique().to_list()
+
+
+def _iter_file_domains(
+    parquet_files: list[str] | list[Path],
+) -> Iterator[tuple[str | Path, Future[tuple[int | None, list[str]]]]]:
+    """
+    Read Parquet files on a thread pool, yielding results in input order.
+
+    Polars releases the GIL while reading and decoding, so files are read
+    concurrently while the caller updates bitmaps. Read-ahead is bounded to
+    keep at most a few results per worker in memory.
+
+    Args:
+        parquet_files: Parquet files to read
+
+    Yields:
+        (parquet_file, future of _read_file_domains(parquet_file))
+    """
+    max_workers = min(32, (os.cpu_count() or 1) + 4)
+    pending: deque[tuple[str | Path, Future]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for parquet_file in parquet_files:
+            pending.append(
+                (parquet_file, executor.submit(_read_file_domains, parquet_file))
+            )
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+def _scan_pairs(parquet_files: list[str] | list[Path]) -> pl.LazyFrame:
+    """
+    Lazily scan (domain, dataset_id) pairs with dataset_id from Hive partitions.
+
+    Args:
+        parquet_files: Parquet files under urls/
+
+    Returns:
+        LazyFrame with columns domain (str) and dataset_id (int)
+    """
+    return pl.scan_parquet(
+        [os.fspath(parquet_file) for parquet_file in parquet_files],
+        hive_partitioning=True,
+        hive_schema={"dataset_id": pl.Int64, "domain_prefix": pl.Utf8},
+    ).select("domain", "dataset_id")
+
+
+def _lookup_frame(domain_lookup: dict[str, int]) -> pl.DataFrame:
+    """Build a (domain, domain_id) frame from a domain lookup for joins."""
+    return pl.DataFrame(
+        {"domain": list(domain_lookup), "domain_id": list(domain_lookup.values())},
+        schema={"domain": pl.Utf8, "domain_id": pl.Int64},
+    )
+
+
+def _scan_domain_datasets(parquet_files: list[str] | list[Path]) -> pl.DataFrame:
+    """
+    Collect the datasets containing each domain across Parquet files.
+
+    Uses a single lazy scan with dataset_id taken from the Hive partition
+    directories, so reading, dedup and grouping all run in Polars. If the
+    files don't share one partition layout (or one is unreadable), falls back
+    to reading files one by one and skipping the bad ones.
+
+    Args:
+        parquet_files: Parquet files under urls/
+
+    Returns:
+        DataFrame with columns domain (str) and dataset_ids (list of int)
+    """
+    try:
+        pairs = _scan_pairs(parquet_files).collect()
+    except (pl.exceptions.PolarsError, OSError) as e:
+        logger.warning(f"Partitioned scan failed ({e}), reading files one by one")
+        frames = []
+        for parquet_file, future in _iter_file_domains(parquet_files):
+            try:
+                dataset_id, unique_domains = future.result()
+            except Exception as e:
+                logger.error(f"Error processing {parquet_file}: {e}")
+                continue
+
+            if dataset_id is None:
+                logger.warning(f"Could not extract dataset_id from {parquet_file}")
+                continue
+
+            frames.append(
+                pl.DataFrame(
+                    {"domain": unique_domains, "dataset_id": dataset_id},
+                    schema=_PAIRS_SCHEMA,
+                )
+            )
+        pairs = pl.concat(frames) if frames else pl.DataFrame(schema=_PAIRS_SCHEMA)
+
+    return (
+        pairs.drop_nulls()
+        .group_by("domain")
+        .agg(pl.col("dataset_id").unique().alias("dataset_ids"))
+    )
+
+
+def _join_domain_ids(
+    domain_datasets: pl.DataFrame, domain_lookup: dict[str, int]
+) -> pl.DataFrame:
+    """
+    Attach domain IDs to per-domain dataset lists with an in-engine join.
+
+    Domains missing from the lookup are dropped with one summary warning.
+
+    Args:
+        domain_datasets: Output of _scan_domain_datasets
+        domain_lookup: Map from domain string to domain_id
+
+    Returns:
+        DataFrame with columns domain_id (int) and dataset_ids (list of int)
+    """
+    joined = domain_datasets.join(_lookup_frame(domain_lookup), on="domain", how="left")
+
+    _warn_missing_domains(joined.filter(pl.col("domain_id").is_null())["domain"])
+
+    return joined.drop_nulls("domain_id").select("domain_id", "dataset_ids")
+
+
+def _warn_missing_domains(missing: pl.Series) -> None:
+    """Log one summary warning for domains not found in the domain lookup."""
+    if len(missing):
+        logger.warning(
+            f"{len(missing)} domains not found in domain lookup - skipping "
+            f"(e.g. {missing.head(5).to_list()})"
+        )
+
+
+def _iter_sorted_bitmaps(pairs_path: Path, num_domains: int) -> Iterator[BitMap]:
+    """
+    Build one bitmap per domain_id from pairs sorted by domain_id.
+
+    Reads the pairs file a record batch at a time, so only one batch and the
+    bitmap being filled are held in memory. Domain IDs without any pairs get
+    an empty bitmap, and pairs with a null domain_id (sorted last) are skipped.
+
+    Args:
+        pairs_path: Parquet file of (domain_id, dataset_id) sorted by domain_id
+        num_domains: Number of bitmaps to yield (domain IDs 0..num_domains-1)
+
+    Yields:
+        BitMap of dataset_ids for domain_id 0, 1, ..., num_domains-1
+    """
+    next_id = 0
+    current = BitMap()
+    for batch in pq.ParquetFile(pairs_path).iter_batches(
+        columns=["domain_id", "dataset_id"]
+    ):
+        if batch.column(0).null_count:
+            batch = batch.filter(batch.column(0).is_valid())
+        domain_ids = batch.column(0).to_numpy()
+        dataset_ids = batch.column(1).to_numpy()
+
+        # Runs of equal domain_id within the batch
+        starts = np.flatnonzero(np.diff(domain_ids)) + 1
+        bounds = [0, *starts.tolist(), len(domain_ids)]
+        for start, end in pairwise(bounds):
+            domain_id = int(domain_ids[start])
+            if domain_id != next_id:
+                # Finish the current domain (a run can continue across batches)
+                yield current
+                next_id += 1
+                while next_id < domain_id:
+                    yield BitMap()
+                    next_id += 1
+                current = BitMap()
+            current.update(dataset_ids[start:end].tolist())
+
+    if next_id < num_domains:
+        yield current
+        next_id += 1
+    while next_id < num_domains:
+        yield BitMap()
+        next_id += 1
+
+
+class _MappedBitmaps(Mapping[int, BitMap]):
+    """
+    Read-only domain_id → BitMap view over a memory-mapped membership index.
+
+    Only the index entries are parsed up front; each bitmap is deserialized
+    on first access and kept in an LRU cache. Cardinalities come from the
+    counts sidecar when one was loaded, without touching the bitmaps.
+    """
+
+    def __init__(
+        self,
+        data: memoryview,
+        index_entries: np.ndarray,
+        cache_size: int,
+        counts: np.ndarray | None = None,
+    ):
+        """
+        Initialize the view.
+
+        Args:
+            data: Buffer holding the whole index file (kept alive by the view)
+            index_entries: Parsed {start, len} entry per domain_id
+            cache_size: Maximum number of deserialized bitmaps to keep
+            counts: Cardinality per domain_id, if known
+        """
+        self._data = data
+        self._starts = index_entries["start"]
+        self._lens = index_entries["len"]
+        self._cached_bitmap = lru_cache(maxsize=cache_size)(self._deserialize)
+        self.counts = counts
+
+    def _deserialize(self, domain_id: int) -> BitMap:
+        start = int(self._starts[domain_id])
+        return BitMap.deserialize(
+            self._data[start : start + int(self._lens[domain_id])]
+        )
+
+    def __getitem__(self, domain_id: int) -> BitMap:
+        if not 0 <= domain_id < len(self._starts):
+            raise KeyError(domain_id)
+        return self._cached_bitmap(domain_id)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self._starts)))
+
+    def cardinality(self, domain_id: int) -> int:
+        """
+        Get the number of datasets in a domain's bitmap.
+
+        Raises:
+            KeyError: If domain_id is out of range
+        """
+        if self.counts is None:
+            return len(self[domain_id])
+        if not 0 <= domain_id < len(self.counts):
+            raise KeyError(domain_id)
+        return int(self.counts[domain_id])
+
+    def to_dict(self) -> dict[int, BitMap]:
+        """
+        Deserialize every bitmap in one pass, bypassing the cache.
+
+        Returns:
+            New dict of domain_id → BitMap (each bitmap owns its memory)
+        """
+        data = self._data
+        return {
+            domain_id: BitMap.deserialize(data[start : start + length])
+            for domain_id, (start, length) in enumerate(
+                zip(self._starts.tolist(), self._lens.tolist())
+            )
+        }
+
 
 class MembershipIndex:
     """
     Build and query domain → datasets membership index using Roaring bitmaps.
     """
 
-    # File format version
-    VERSION = 1
+    # File format version (1 has no CRC-32 trailer; still readable)
+    VERSION = 2
+    HEADER_SIZE = 24
     MAGIC = b"DTDR"
+    # Index entry: {bitmap_start:uint64, bitmap_len:uint32}, packed
+    INDEX_DTYPE = np.dtype([("start", "<u8"), ("len", "<u4")])
+    # Sidecar of per-domain cardinalities (uint32), next to the index file
+    COUNTS_SUFFIX = ".counts.npy"
+    # Deserialized bitmaps kept per loaded index
+    BITMAP_CACHE_SIZE = 4096
 
     def __init__(self, base_path: Path):
         """
@@ -39,7 +340,8 @@ class MembershipIndex:
         """
         self.base_path = Path(base_path)
         self.layout = StorageLayout(base_path)
-        self.domain_bitmaps: dict[int, BitMap] = {}  # domain_id → BitMap of dataset_ids
+        # domain_id → BitMap of dataset_ids (lazily deserialized after load())
+        self.domain_bitmaps: Mapping[int, BitMap] = {}
 
     def extract_memberships(self, domain_lookup: dict[str, int]) -> None:
         """
@@ -56,183 +358,389 @@ class MembershipIndex:
             logger.warning(f"URLs directory does not exist: {urls_dir}")
             return
 
-        parquet_files = list(urls_dir.rglob("*.parquet"))
+        parquet_files = _list_parquet_files(str(urls_dir))
         if not parquet_files:
             logger.warning("No Parquet files found")
             return
 
         logger.info(f"Found {len(parquet_files)} Parquet files to scan")
 
-        # Extract memberships
-        for i, parquet_file in enumerate(parquet_files, 1):
-            if i % 100 == 0:
-                logger.info(
-                    f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(self.domain_bitmaps)} domains indexed"
-                )
-
-            try:
-                # Parse dataset_id from path (dataset_id=N/domain_prefix=XX/part-*.parquet)
-                parts = parquet_file.parts
-                dataset_id = None
-                for part in parts:
-                    if part.startswith("dataset_id="):
-                        dataset_id = int(part.split("=")[1])
-                        break
-
-                if dataset_id is None:
-                    logger.warning(f"Could not extract dataset_id from {parquet_file}")
-                    continue
-
-                # Read domain column
-                df = pl.read_parquet(parquet_file, columns=["domain"])
-                unique_domains = df["domain"].unique().to_list()
-
-                # Update bitmaps
-                for domain in unique_domains:
-                    domain_id = domain_lookup.get(domain)
-                    if domain_id is None:
-                        logger.warning(
-                            f"Domain '{domain}' not found in domain lookup - skipping"
-                        )
-                        continue
-
-                    if domain_id not in self.domain_bitmaps:
-                        self.domain_bitmaps[domain_id] = BitMap()
-
-                    self.domain_bitmaps[domain_id].add(dataset_id)
+        domain_datasets = _join_domain_ids(
+            _scan_domain_datasets(parquet_files), domain_lookup
+        )
 
-            except Exception as e:
-                logger.error(f"Error processing {parquet_file}: {e}")
-                continue
+        # Build bitmaps
+        self.domain_bitmaps = {
+            domain_id: BitMap(dataset_ids)
+            for domain_id, dataset_ids in zip(
+                domain_datasets["domain_id"].to_list(),
+                domain_datasets["dataset_ids"].to_list(),
+            )
+        }
 
         logger.info(
             f"Extracted memberships for {len(self.domain_bitmaps)} unique domains"
         )
 
-    def save(self, output_path: Path) -> None:
+    def save(self, output_path: Path, num_domains: int | None = None) -> None:
         """
         Save membership index to disk.
 
         File format:
-        [magic=DTDR][ver=1][N_domains:uint64][index_offset:uint64]
+        [magic=DTDR][ver=2][N_domains:uint64][index_offset:uint64]
         [bitmaps... concatenated]
         [index: N_domains entries of {bitmap_start:uint64, bitmap_len:uint32}]
+        [crc32:uint32]
+
+        The trailing CRC-32 covers the bitmaps and index followed by the
+        24-byte header, so it can be accumulated while streaming.
+
+        Entry i of the index holds domain_id i, so domain IDs are written in
+        order without sorting. Given num_domains (the size of the domain
+        lookup), domains with no bitmap get an empty one; otherwise domain
+        IDs must be exactly 0..len(domain_bitmaps)-1.
 
         Args:
             output_path: Path to save membership index
+            num_domains: Number of domain IDs to write (default: one per bitmap)
+
+        Raises:
+            ValueError: If a domain ID is missing (without num_domains) or is
+                outside 0..num_domains-1
         """
         logger.info(f"Saving membership index to {output_path}...")
 
-        # Sort domains for consistent ordering
-        sorted_domain_ids = sorted(self.domain_bitmaps.keys())
+        if num_domains is None:
+            num_domains = len(self.domain_bitmaps)
+            bitmaps = self._dense_bitmaps(num_domains)
+        else:
+            bitmaps = self._padded_bitmaps(num_domains)
+        total_size, total_dataset_refs = self._write_bitmaps(
+            output_path, num_domains, bitmaps
+        )
+
+        # Log statistics
+        logger.info(
+            f"Saved membership index: {total_size:,} bytes, "
+            f"{num_domains} domains, "
+            f"{total_dataset_refs} total dataset references"
+        )
+
+    def _dense_bitmaps(self, num_domains: int) -> Iterator[BitMap]:
+        """
+        Yield domain_bitmaps in domain_id order.
+
+        Raises:
+            ValueError: If a domain_id in 0..num_domains-1 has no bitmap
+        """
+        for domain_id in range(num_domains):
+            try:
+                yield self.domain_bitmaps[domain_id]
+            except KeyError:
+                raise ValueError(
+                    f"Domain IDs are not dense: {domain_id} missing "
+                    f"from {num_domains} domains"
+                ) from None
+
+    def _padded_bitmaps(self, num_domains: int) -> Iterator[BitMap]:
+        """
+        Yield domain_bitmaps in domain_id order, with empty bitmaps for gaps.
+
+        Raises:
+            ValueError: If a domain_id is outside 0..num_domains-1
+        """
+        if self.domain_bitmaps and (
+            min(self.domain_bitmaps) < 0 or max(self.domain_bitmaps) >= num_domains
+        ):
+            raise ValueError(
+                f"Domain IDs out of range for {num_domains} domains: "
+                f"{min(self.domain_bitmaps)}..{max(self.domain_bitmaps)}"
+            )
+        for domain_id in range(num_domains):
+            bitmap = self.domain_bitmaps.get(domain_id)
+            yield BitMap() if bitmap is None else bitmap
 
-        # Build binary data
-        data = bytearray()
+    def _write_bitmaps(
+        self, output_path: Path, num_domains: int, bitmaps: Iterable[BitMap]
+    ) -> tuple[int, int]:
+        """
+        Write bitmaps for domain IDs 0..num_domains-1 in the save() format.
 
-        # Header (we'll fill in index_offset later)
-        data.extend(self.MAGIC)  # Magic
-        data.extend(struct.pack("<I", self.VERSION))  # Version
-        data.extend(struct.pack("<Q", len(sorted_domain_ids)))  # N_domains
-        index_offset_pos = len(data)
-        data.extend(struct.pack("<Q", 0))  # Placeholder for index_offset
+        Args:
+            output_path: Path to save membership index
+            num_domains: Number of bitmaps in bitmaps
+            bitmaps: Bitmap for each domain_id, in domain_id order
 
-        # Write bitmaps and build index
-        index_entries = []
-        for domain_id in sorted_domain_ids:
-            bitmap = self.domain_bitmaps[domain_id]
+        Returns:
+            (file size in bytes, total dataset references)
+        """
+        # Stream to disk: header, bitmaps, then index, one bitmap in memory
+        # at a time
+        # Written to a temp file and renamed into place, so a loaded index that
+        # is still memory-mapped from output_path is never truncated under it
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = output_path.with_suffix(".tmp")
+        try:
+            with temp_path.open("wb") as f:
+                # Header is written once index_offset is known
+                f.seek(self.HEADER_SIZE)
+
+                # Write bitmaps and build index
+                index_entries = np.empty(num_domains, dtype=self.INDEX_DTYPE)
+                position = self.HEADER_SIZE
+                crc = 0
+                counts = np.empty(num_domains, dtype=np.uint32)
+                for domain_id, bitmap in enumerate(bitmaps):
+                    # Use run containers where smaller (contiguous dataset ids),
+                    # on a copy: bitmaps may be cached or held by the caller
+                    optimized = BitMap(bitmap)
+                    optimized.run_optimize()
+                    bitmap_bytes = optimized.serialize()
+                    f.write(bitmap_bytes)
+                    crc = zlib.crc32(bitmap_bytes, crc)
+                    counts[domain_id] = len(bitmap)
+
+                    # Record index entry
+                    index_entries[domain_id] = (position, len(bitmap_bytes))
+                    position += len(bitmap_bytes)
+
+                # Write index
+                index_offset = position
+                index_bytes = index_entries.tobytes()
+                f.write(index_bytes)
+                crc = zlib.crc32(index_bytes, crc)
+
+                # Header
+                header = self.MAGIC + struct.pack(
+                    "<IQQ", self.VERSION, num_domains, index_offset
+                )
+                crc = zlib.crc32(header, crc)
+
+                # Trailer
+                f.write(struct.pack("<I", crc))
+                total_size = f.tell()
+
+                f.seek(0)
+                f.write(header)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        # Drop the old counts before replacing the index, so a crash in between
+        # leaves no sidecar rather than a stale one
+        counts_path = self._counts_path(output_path)
+        counts_path.unlink(missing_ok=True)
+        os.replace(temp_path, output_path)
+
+        temp_counts_path = counts_path.with_suffix(".tmp")
+        with temp_counts_path.open("wb") as f:
+            np.save(f, counts)
+        os.replace(temp_counts_path, counts_path)
+
+        return total_size, int(counts.sum(dtype=np.uint64))
+
+    def _counts_path(self, index_path: Path) -> Path:
+        """Get the counts sidecar path for an index file."""
+        return index_path.with_suffix(self.COUNTS_SUFFIX)
+
+    def extract_and_save(
+        self, domain_lookup: dict[str, int], output_path: Path
+    ) -> None:
+        """
+        Extract memberships from all Parquet files and stream them to disk.
 
-            # Serialize bitmap
-            bitmap_bytes = bitmap.serialize()
-            bitmap_start = len(data)
-            data.extend(bitmap_bytes)
+        Unlike extract_memberships() followed by save(), the bitmaps are never
+        all held in memory: deduplicated (domain_id, dataset_id) pairs are
+        sorted by Polars' streaming engine into a temporary Parquet file next
+        to output_path, then read back in batches and written one bitmap at a
+        time. Domains missing from domain_lookup are skipped with one summary
+        warning. Falls back to building the bitmaps in memory with
+        extract_memberships() if the partitioned scan fails.
 
-            # Record index entry
-            index_entries.append((bitmap_start, len(bitmap_bytes)))
+        Afterwards domain_bitmaps is a lazy view of the saved file.
 
-        # Update index_offset in header
-        index_offset = len(data)
-        struct.pack_into("<Q", data, index_offset_pos, index_offset)
+        Args:
+            domain_lookup: Map from domain string to domain_id (IDs must be
+                0..len(domain_lookup)-1)
+            output_path: Path to save membership index
+        """
+        logger.info("Extracting and saving domain → datasets memberships...")
 
-        # Write index
-        for bitmap_start, bitmap_len in index_entries:
-            data.extend(struct.pack("<Q", bitmap_start))  # Bitmap start
-            data.extend(struct.pack("<I", bitmap_len))  # Bitmap length
+        urls_dir = self.base_path / "urls"
+        parquet_files = _list_parquet_files(str(urls_dir)) if urls_dir.exists() else []
+        logger.info(f"Found {len(parquet_files)} Parquet files to scan")
 
-        # Write to disk
+        num_domains = len(domain_lookup)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(bytes(data))
+        pairs_path = output_path.with_suffix(".pairs.parquet")
+        try:
+            if parquet_files:
+                try:
+                    (
+                        _scan_pairs(parquet_files)
+                        .drop_nulls()
+                        .join(
+                            _lookup_frame(domain_lookup).lazy(),
+                            on="domain",
+                            how="left",
+                        )
+                        .select(
+                            "domain_id",
+                            "dataset_id",
+                            # Kept only for domains missing from the lookup
+                            pl.when(pl.col("domain_id").is_null())
+                            .then(pl.col("domain"))
+                            .alias("domain"),
+                        )
+                        .unique()
+                        .sort("domain_id", nulls_last=True)
+                        .sink_parquet(pairs_path)
+                    )
+                    _warn_missing_domains(
+                        pl.scan_parquet(pairs_path)
+                        .filter(pl.col("domain_id").is_null())
+                        .select(pl.col("domain").unique())
+                        .collect()["domain"]
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"Streaming extraction failed ({e}), building bitmaps in memory"
+                    )
+                    self.extract_memberships(domain_lookup)
+                    bitmaps = self._padded_bitmaps(num_domains)
+                else:
+                    bitmaps = _iter_sorted_bitmaps(pairs_path, num_domains)
+            else:
+                bitmaps = (BitMap() for _ in range(num_domains))
+
+            total_size, total_dataset_refs = self._write_bitmaps(
+                output_path, num_domains, bitmaps
+            )
+        finally:
+            pairs_path.unlink(missing_ok=True)
 
-        # Log statistics
-        total_dataset_refs = sum(len(bm) for bm in self.domain_bitmaps.values())
         logger.info(
-            f"Saved membership index: {len(data):,} bytes, "
-            f"{len(sorted_domain_ids)} domains, "
+            f"Saved membership index: {total_size:,} bytes, "
+            f"{num_domains} domains, "
             f"{total_dataset_refs} total dataset references"
         )
 
-    def load(self, input_path: Path, num_domains: int) -> None:
+        self.load(output_path, num_domains)
+
+    def load(self, input_path: Path, num_domains: int, verify: bool = False) -> None:
         """
         Load membership index from disk.
 
         Args:
             input_path: Path to membership index file
             num_domains: Expected number of domains (for validation)
+            verify: Check the file's CRC-32 first (reads every page; see
+                verify())
         """
         logger.info(f"Loading membership index from {input_path}...")
 
         if not input_path.exists():
             raise FileNotFoundError(f"Membership index not found: {input_path}")
 
-        data = input_path.read_bytes()
+        # Memory-map the file: only the header and index are parsed here, and
+        # bitmaps deserialize straight from the mapped pages when first used
+        with input_path.open("rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        data = memoryview(mm)
+        if verify:
+            self._verify_buffer(data)
+        self._load_from_buffer(data, num_domains)
+
+        counts_path = self._counts_path(input_path)
+        if counts_path.exists():
+            counts = np.load(counts_path, mmap_mode="r")
+            if counts.shape == (len(self.domain_bitmaps),):
+                self.domain_bitmaps.counts = counts
+            else:
+                logger.warning(
+                    f"Ignoring {counts_path}: {counts.shape[0]} counts for "
+                    f"{len(self.domain_bitmaps)} domains"
+                )
 
-        # Parse header
-        offset = 0
+        logger.info(f"Loaded membership index: {len(self.domain_bitmaps)} domains")
+
+    def verify(self, input_path: Path) -> None:
+        """
+        Check a membership index file against its CRC-32 trailer.
+
+        Version 1 files have no trailer and are not checked.
+
+        Args:
+            input_path: Path to membership index file
 
-        magic = data[offset : offset + 4]
-        offset += 4
+        Raises:
+            ValueError: If the file is not a membership index or the
+                checksum does not match
+        """
+        with (
+            input_path.open("rb") as f,
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+            memoryview(mm) as data,
+        ):
+            self._verify_buffer(data)
+
+    def _verify_buffer(self, data: memoryview) -> None:
+        """
+        Check a serialized membership index against its CRC-32 trailer.
+
+        Args:
+            data: Buffer holding the whole index file
+
+        Raises:
+            ValueError: If the magic or checksum does not match
+        """
+        magic = bytes(data[0:4])
         if magic != self.MAGIC:
             raise ValueError(f"Invalid membership index: bad magic {magic}")
 
-        version = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
-        if version != self.VERSION:
-            raise ValueError(f"Unsupported membership index version: {version}")
+        (version,) = struct.unpack_from("<I", data, 4)
+        if version < 2:
+            return
+
+        # One sequential pass over the file (zlib's CRC-32 runs at GB/s)
+        (expected_crc,) = struct.unpack_from("<I", data, len(data) - 4)
+        crc = zlib.crc32(data[self.HEADER_SIZE : len(data) - 4])
+        crc = zlib.crc32(data[: self.HEADER_SIZE], crc)
+        if crc != expected_crc:
+            raise ValueError(
+                f"Membership index checksum mismatch: "
+                f"expected {expected_crc:#010x}, got {crc:#010x}"
+            )
+
+    def _load_from_buffer(self, data: memoryview, num_domains: int) -> None:
+        """
+        Parse a serialized membership index into a lazy domain_bitmaps view.
 
-        n_domains = struct.unpack("<Q", data[offset : offset + 8])[0]
-        offset += 8
+        Args:
+            data: Buffer holding the whole index file (kept alive by the view)
+            num_domains: Expected number of domains (for validation)
+        """
+        # Parse header
+        magic = bytes(data[0:4])
+        if magic != self.MAGIC:
+            raise ValueError(f"Invalid membership index: bad magic {magic}")
 
-        index_offset = struct.unpack("<Q", data[offset : offset + 8])[0]
-        offset += 8
+        version, n_domains, index_offset = struct.unpack_from("<IQQ", data, 4)
+        if version not in (1, self.VERSION):
+            raise ValueError(f"Unsupported membership index version: {version}")
 
         if n_domains != num_domains:
             logger.warning(
                 f"Domain count mismatch: expected {num_domains}, got {n_domains}"
             )
 
-        # Read index
-        index_entries = []
-        offset = index_offset
-        for _ in range(n_domains):
-            bitmap_start = struct.unpack("<Q", data[offset : offset + 8])[0]
-            offset += 8
-
-            bitmap_len = struct.unpack("<I", data[offset : offset + 4])[0]
-            offset += 4
-
-            index_entries.append((bitmap_start, bitmap_len))
-
-        # Load bitmaps
-        self.domain_bitmaps = {}
-        for domain_id, (bitmap_start, bitmap_len) in enumerate(index_entries):
-            bitmap_bytes = data[bitmap_start : bitmap_start + bitmap_len]
-            bitmap = BitMap.deserialize(bitmap_bytes)
-            self.domain_bitmaps[domain_id] = bitmap
+        # Read index (one vectorized parse of the fixed-width entries)
+        index_entries = np.frombuffer(
+            data, dtype=self.INDEX_DTYPE, count=n_domains, offset=index_offset
+        )
 
-        total_dataset_refs = sum(len(bm) for bm in self.domain_bitmaps.values())
-        logger.info(
-            f"Loaded membership index: {len(self.domain_bitmaps)} domains, "
-            f"{total_dataset_refs} total dataset references"
+        self.domain_bitmaps = _MappedBitmaps(
+            data, index_entries, self.BITMAP_CACHE_SIZE
         )
 
     def get_datasets(self, domain_id: int) -> list[int]:
@@ -260,11 +768,33 @@ class MembershipIndex:
         Returns:
             Count of datasets, or 0 if domain not found
         """
+        if isinstance(self.domain_bitmaps, _MappedBitmaps):
+            try:
+                return self.domain_bitmaps.cardinality(domain_id)
+            except KeyError:
+                return 0
+
         bitmap = self.domain_bitmaps.get(domain_id)
         if bitmap is None:
             return 0
         return len(bitmap)
 
+    def total_dataset_refs(self) -> int:
+        """
+        Get the total number of (domain, dataset) pairs across all bitmaps.
+
+        Returns:
+            Sum of bitmap cardinalities
+        """
+        if (
+            isinstance(self.domain_bitmaps, _MappedBitmaps)
+            and self.domain_bitmaps.counts is not None
+        ):
+            return int(self.domain_bitmaps.counts.sum(dtype=np.uint64))
+
+        # map(len, ...) keeps the per-bitmap loop in C
+        return sum(map(len, self.domain_bitmaps.values()))
+
     def build(
         self, domain_lookup: dict[str, int], version: str, base_path: Path
     ) -> Path:
@@ -279,10 +809,8 @@ class MembershipIndex:
         Returns:
             Path to saved membership index file
         """
-        self.extract_memberships(domain_lookup)
-
         output_path = base_path / "index" / version / "domain_to_datasets.roar"
-        self.save(output_path)
+        self.extract_and_save(domain_lookup, output_path)
 
         return output_path
 
@@ -304,48 +832,18 @@ class MembershipIndex:
         )
 
         memberships: dict[int, set[int]] = {}
+        if not parquet_files:
+            return memberships
 
-        for i, parquet_file in enumerate(parquet_files, 1):
-            if i % 100 == 0:
-                logger.info(
-                    f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(memberships)} domains indexed"
-                )
-
-            try:
-                # Parse dataset_id from path
-                parts = parquet_file.parts
-                dataset_id = None
-                for part in parts:
-                    if part.startswith("dataset_id="):
-                        dataset_id = int(part.split("=")[1])
-                        break
-
-                if dataset_id is None:
-                    logger.warning(f"Could not extract dataset_id from {parquet_file}")
-                    continue
-
-                # Read domain column
-                df = pl.read_parquet(parquet_file, columns=["domain"])
-                unique_domains = df["domain"].unique().to_list()
-
-                # Update memberships
-                for domain in unique_domains:
-                    domain_id = domain_lookup.get(domain)
-                    if domain_id is None:
-                        logger.warning(
-                            f"Domain '{domain}' not found in domain lookup - skipping"
-                        )
-                        continue
-
-                    if domain_id not in memberships:
-                        memberships[domain_id] = set()
-
-                    memberships[domain_id].add(dataset_id)
+        domain_datasets = _join_domain_ids(
+            _scan_domain_datasets(parquet_files), domain_lookup
+        )
 
-            except Exception as e:
-                logger.error(f"Error processing {parquet_file}: {e}")
-                continue
+        for domain_id, dataset_ids in zip(
+            domain_datasets["domain_id"].to_list(),
+            domain_datasets["dataset_ids"].to_list(),
+        ):
+            memberships[domain_id] = set(dataset_ids)
 
         logger.info(
             f"Extracted memberships for {len(memberships)} domains from new files"
@@ -355,8 +853,9 @@ class MembershipIndex:
 
     def merge_memberships(
         self,
-        old_bitmaps: dict[int, BitMap],
+        old_bitmaps: Mapping[int, BitMap],
         new_memberships: dict[int, set[int]],
+        in_place: bool = False,
     ) -> dict[int, BitMap]:
         """
         Merge old bitmaps with new memberships.
@@ -364,6 +863,9 @@ class MembershipIndex:
         Args:
             old_bitmaps: Existing domain_id → BitMap mapping
             new_memberships: New domain_id → set of dataset_ids
+            in_place: If True and old_bitmaps is a dict, update and return it
+                instead of cloning every bitmap first. The caller must not
+                rely on old_bitmaps staying unchanged.
 
         Returns:
             Merged domain_id → BitMap mapping
@@ -374,10 +876,15 @@ class MembershipIndex:
         )
 
         # Start with copy of old bitmaps
-        merged = {}
-        for domain_id, bitmap in old_bitmaps.items():
-            # Create a copy of the bitmap
-            merged[domain_id] = BitMap(bitmap)
+        if isinstance(old_bitmaps, _MappedBitmaps):
+            # Freshly deserialized bitmaps are already private copies
+            merged = old_bitmaps.to_dict()
+        elif in_place and isinstance(old_bitmaps, dict):
+            merged = old_bitmaps
+        else:
+            merged = {
+                domain_id: BitMap(bitmap) for domain_id, bitmap in old_bitmaps.items()
+            }
 
         # Merge in new memberships
         num_updated = 0
@@ -385,9 +892,8 @@ class MembershipIndex:
 
         for domain_id, dataset_ids in new_memberships.items():
             if domain_id in merged:
-                # Update existing bitmap
-                for dataset_id in dataset_ids:
-                    merged[domain_id].add(dataset_id)
+                # Update existing bitmap (one bulk add in C)
+                merged[domain_id].update(dataset_ids)
                 num_updated += 1
             else:
                 # Create new bitmap
@@ -427,14 +933,14 @@ class MembershipIndex:
         logger.info("Building membership index incrementally...")
 
         # Load previous bitmaps if available
-        old_bitmaps = {}
+        old_bitmaps: Mapping[int, BitMap] = {}
         if prev_membership_path and prev_membership_path.exists():
             try:
                 logger.info(
                     f"Loading previous membership index from {prev_membership_path}"
                 )
                 self.load(prev_membership_path, num_old_domains)
-                old_bitmaps = self.domain_bitmaps.copy()
+                old_bitmaps = self.domain_bitmaps
                 logger.info(f"Loaded {len(old_bitmaps)} bitmaps from previous version")
             except Exception as e:
                 logger.warning(
@@ -445,11 +951,13 @@ class MembershipIndex:
         new_memberships = self.extract_memberships_from_files(new_files, domain_lookup)
 
         # Merge old + new
-        self.domain_bitmaps = self.merge_memberships(old_bitmaps, new_memberships)
+        self.domain_bitmaps = self.merge_memberships(
+            old_bitmaps, new_memberships, in_place=True
+        )
 
         # Save merged index
         output_path = base_path / "index" / version / "domain_to_datasets.roar"
-        self.save(output_path)
+        self.save(output_path, len(domain_lookup))
 
         logger.info(
             f"Built incremental membership index: "
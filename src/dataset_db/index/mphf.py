@@ -1,13 +1,13 @@
 """
 Minimal Perfect Hash Function (MPHF) implementation.
 
-Uses a simple hash-based approach with collision handling as suggested in spec.md §1.2:
-- Primary: xxh3_64(domain) → domain_id lookup
-- Collision map: Small map for hash collisions (rare)
-- Tag: 16-bit tag (xxh3_64 >> 48) for early rejection
+Uses a hash-based approach with collision handling as suggested in spec.md §1.2:
+- Primary: xxh3_64(domain) fingerprints, sorted, with a parallel domain_id array
+  (12 bytes per domain, binary-searched on lookup)
+- Collision map: Small map for hash collisions (rare), verified by domain string
 
-For production scale, could be replaced with BBHash or similar MPHF library.
-This implementation prioritizes simplicity and correctness.
+The arrays are serialized as-is, so loading is a decompress plus np.frombuffer
+with no per-domain Python work.
 """
 
 import logging
@@ -15,11 +15,35 @@ import struct
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import xxhash
 import zstandard as zstd
 
 logger = logging.getLogger(__name__)
 
+# Version 1 hash map entry: {hash:uint64, domain_id:uint32}, packed
+_V1_ENTRY_DTYPE = np.dtype([("hash", "<u8"), ("id", "<u4")])
+
+
+def _hash_domains(domains: list[str]) -> np.ndarray:
+    """
+    Compute xxh3_64 hashes of domains.
+
+    Chained map() calls keep the per-domain encode and hash in C, with no
+    Python frame per domain, and fill a preallocated array.
+
+    Args:
+        domains: Domain strings
+
+    Returns:
+        uint64 array of hashes, one per domain
+    """
+    return np.fromiter(
+        map(xxhash.xxh3_64_intdigest, map(str.encode, domains)),
+        dtype=np.uint64,
+        count=len(domains),
+    )
+
 
 class SimpleMPHF:
     """
@@ -28,16 +52,17 @@ class SimpleMPHF:
     Maps domain strings to their sequential IDs in the domain dictionary.
     """
 
-    # File format version
-    VERSION = 1
+    # File format version (1 stored interleaved hash/id entries; still readable)
+    VERSION = 2
 
     def __init__(self):
         """Initialize MPHF."""
-        self.domain_to_id: dict[str, int] = {}
-        self.hash_to_id: dict[int, int] = {}  # hash64 → domain_id
+        # Sorted hash64 of every non-colliding domain, and its domain_id
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.ids = np.empty(0, dtype=np.uint32)
         self.collision_map: dict[
-            int, list[tuple[int, str, int]]
-        ] = {}  # hash64 → [(tag, domain, id), ...]
+            int, list[tuple[str, int]]
+        ] = {}  # hash64 → [(domain, id), ...]
 
     def build(self, domains: list[str]) -> None:
         """
@@ -48,39 +73,10 @@ class SimpleMPHF:
         """
         logger.info(f"Building MPHF for {len(domains)} domains...")
 
-        collision_count = 0
-
-        for domain_id, domain in enumerate(domains):
-            # Store in main lookup
-            self.domain_to_id[domain] = domain_id
-
-            # Compute hash and tag
-            hash_val = xxhash.xxh3_64_intdigest(domain.encode("utf-8"))
-            tag = (hash_val >> 48) & 0xFFFF  # 16-bit tag from high bits
-
-            # Check for hash collision
-            if hash_val in self.hash_to_id:
-                # Collision detected - add to collision map
-                collision_count += 1
-
-                if hash_val not in self.collision_map:
-                    # Move existing entry to collision map
-                    existing_id = self.hash_to_id[hash_val]
-                    existing_domain = domains[existing_id]
-                    existing_hash = xxhash.xxh3_64_intdigest(
-                        existing_domain.encode("utf-8")
-                    )
-                    existing_tag = (existing_hash >> 48) & 0xFFFF
-
-                    self.collision_map[hash_val] = [
-                        (existing_tag, existing_domain, existing_id)
-                    ]
-
-                # Add current entry to collision map
-                self.collision_map[hash_val].append((tag, domain, domain_id))
-            else:
-                # No collision - direct mapping
-                self.hash_to_id[hash_val] = domain_id
+        self.hashes = np.empty(0, dtype=np.uint64)
+        self.ids = np.empty(0, dtype=np.uint32)
+        self.collision_map = {}
+        collision_count = self._insert_domains(domains, start_id=0)
 
         logger.info(
             f"MPHF built: {len(domains)} domains, {collision_count} hash collisions"
@@ -91,6 +87,87 @@ class SimpleMPHF:
                 f"Found {collision_count} hash collisions - this is expected but rare"
             )
 
+    def extend(self, domains: list[str], start_id: int) -> None:
+        """
+        Add appended domains to an already built (or loaded) MPHF.
+
+        Domain IDs are append-only across incremental builds, so only
+        domains[start_id:] need to be hashed; existing entries are kept.
+
+        Args:
+            domains: Full domain list for the new version
+            start_id: Number of domains already present in this MPHF
+        """
+        logger.info(
+            f"Extending MPHF with {len(domains) - start_id} new domains "
+            f"({start_id} existing)..."
+        )
+
+        collision_count = self._insert_domains(domains, start_id=start_id)
+
+        logger.info(
+            f"MPHF extended: {len(domains)} domains, "
+            f"{collision_count} new hash collisions"
+        )
+
+    def _insert_domains(self, domains: list[str], start_id: int) -> int:
+        """
+        Insert domains[start_id:] into the hash tables.
+
+        Args:
+            domains: Full domain list (used to resolve colliding entries)
+            start_id: Domain ID of the first domain to insert
+
+        Returns:
+            Number of hash collisions encountered
+        """
+        new_hashes = _hash_domains(domains[start_id:])
+        new_ids = np.arange(start_id, len(domains), dtype=np.uint32)
+        collision_count = 0
+
+        # New domains hashing onto an existing collision chain join it
+        if self.collision_map:
+            chained = np.isin(
+                new_hashes,
+                np.fromiter(self.collision_map, dtype=np.uint64),
+            )
+            for hash_val, domain_id in zip(
+                new_hashes[chained].tolist(), new_ids[chained].tolist()
+            ):
+                self.collision_map[hash_val].append((domains[domain_id], domain_id))
+            collision_count += int(chained.sum())
+            new_hashes = new_hashes[~chained]
+            new_ids = new_ids[~chained]
+
+        # Merge with existing entries, sorted by hash (one vectorized pass)
+        hashes = np.concatenate([self.hashes, new_hashes])
+        ids = np.concatenate([self.ids, new_ids])
+        order = np.argsort(hashes, kind="stable")
+        hashes = hashes[order]
+        ids = ids[order]
+
+        # Equal neighbours are collisions - move every entry sharing the hash
+        # to the collision map
+        duplicate = hashes[1:] == hashes[:-1]
+        if duplicate.any():
+            collision_count += int(duplicate.sum())
+            colliding = np.zeros(len(hashes), dtype=bool)
+            colliding[1:] |= duplicate
+            colliding[:-1] |= duplicate
+            for hash_val, domain_id in zip(
+                hashes[colliding].tolist(), ids[colliding].tolist()
+            ):
+                self.collision_map.setdefault(hash_val, []).append(
+                    (domains[domain_id], domain_id)
+                )
+            hashes = hashes[~colliding]
+            ids = ids[~colliding]
+
+        self.hashes = hashes
+        self.ids = ids
+
+        return collision_count
+
     def lookup(self, domain: str) -> Optional[int]:
         """
         Look up domain ID by domain string.
@@ -101,34 +178,68 @@ class SimpleMPHF:
         Returns:
             Domain ID if found, None otherwise
         """
-        # Fast path: check direct map
-        if domain in self.domain_to_id:
-            return self.domain_to_id[domain]
-
         # Compute hash
         hash_val = xxhash.xxh3_64_intdigest(domain.encode("utf-8"))
-        tag = (hash_val >> 48) & 0xFFFF
-
-        # Check direct hash mapping
-        if hash_val in self.hash_to_id and hash_val not in self.collision_map:
-            return self.hash_to_id[hash_val]
 
         # Check collision map
-        if hash_val in self.collision_map:
-            for stored_tag, stored_domain, domain_id in self.collision_map[hash_val]:
-                if tag == stored_tag and domain == stored_domain:
-                    return domain_id
+        if self.collision_map:
+            entries = self.collision_map.get(hash_val)
+            if entries is not None:
+                for stored_domain, domain_id in entries:
+                    if domain == stored_domain:
+                        return domain_id
+                return None
+
+        # Binary search the sorted hashes (item() compares and returns plain
+        # ints, avoiding numpy scalar boxing)
+        i = int(self.hashes.searchsorted(np.uint64(hash_val)))
+        if i < len(self.hashes) and self.hashes.item(i) == hash_val:
+            return self.ids.item(i)
 
         return None
 
+    def lookup_many(self, domains: list[str]) -> np.ndarray:
+        """
+        Look up domain IDs for many domains at once.
+
+        Hashing and the binary search run in one vectorized pass, so the
+        per-domain cost is a fraction of calling lookup() in a loop.
+
+        Args:
+            domains: Domain strings to look up
+
+        Returns:
+            int64 array of domain IDs, aligned with domains (-1 if not found)
+        """
+        hashes = _hash_domains(domains)
+        result = np.full(len(domains), -1, dtype=np.int64)
+        if len(self.hashes):
+            positions = np.minimum(
+                self.hashes.searchsorted(hashes), len(self.hashes) - 1
+            )
+            found = self.hashes[positions] == hashes
+            result[found] = self.ids[positions[found]]
+
+        # Colliding hashes are resolved by domain string
+        if self.collision_map:
+            colliding = np.isin(
+                hashes, np.fromiter(self.collision_map, dtype=np.uint64)
+            )
+            for i in np.flatnonzero(colliding).tolist():
+                domain_id = self.lookup(domains[i])
+                result[i] = -1 if domain_id is None else domain_id
+
+        return result
+
     def save(self, output_path: Path, compression_level: int = 6) -> None:
         """
         Save MPHF to disk with compression.
 
         File format:
-        - Header: [magic=MPHF][version:u32][num_domains:u64][num_collisions:u32]
-        - Hash map: [hash:u64, domain_id:u32] * num_domains
-        - Collision map: [hash:u64, num_entries:u16, [(tag:u16, domain_len:u16, domain:bytes, id:u32)] * num_entries] * num_collisions
+        - Header: [magic=MPHF][version:u32][num_hashes:u64][num_collisions:u32]
+        - Hashes: [hash:u64] * num_hashes, sorted
+        - Domain IDs: [domain_id:u32] * num_hashes, aligned with the hashes
+        - Collision map: [hash:u64, num_entries:u16, [(domain_len:u16, domain:bytes, id:u32)] * num_entries] * num_collisions
 
         Args:
             output_path: Path to save MPHF file
@@ -142,23 +253,20 @@ class SimpleMPHF:
         # Header
         data.extend(b"MPHF")  # Magic
         data.extend(struct.pack("<I", self.VERSION))  # Version
-        data.extend(struct.pack("<Q", len(self.hash_to_id)))  # Num domains
+        data.extend(struct.pack("<Q", len(self.hashes)))  # Num hashes
         data.extend(struct.pack("<I", len(self.collision_map)))  # Num collisions
 
         # Hash map (non-collision entries)
-        for hash_val, domain_id in sorted(self.hash_to_id.items()):
-            if hash_val not in self.collision_map:
-                data.extend(struct.pack("<Q", hash_val))  # Hash
-                data.extend(struct.pack("<I", domain_id))  # Domain ID
+        data.extend(self.hashes.astype("<u8", copy=False).tobytes())
+        data.extend(self.ids.astype("<u4", copy=False).tobytes())
 
         # Collision map
         for hash_val, entries in sorted(self.collision_map.items()):
             data.extend(struct.pack("<Q", hash_val))  # Hash
             data.extend(struct.pack("<H", len(entries)))  # Num entries
 
-            for tag, domain, domain_id in entries:
+            for domain, domain_id in entries:
                 domain_bytes = domain.encode("utf-8")
-                data.extend(struct.pack("<H", tag))  # Tag
                 data.extend(struct.pack("<H", len(domain_bytes)))  # Domain length
                 data.extend(domain_bytes)  # Domain
                 data.extend(struct.pack("<I", domain_id))  # Domain ID
@@ -199,70 +307,62 @@ class SimpleMPHF:
         data = decompressor.decompress(compressed_data)
 
         # Parse header
-        offset = 0
-
-        magic = data[offset : offset + 4]
-        offset += 4
+        magic = data[0:4]
         if magic != b"MPHF":
             raise ValueError(f"Invalid MPHF file: bad magic {magic}")
 
-        version = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
-        if version != self.VERSION:
+        version, num_entries, num_collisions = struct.unpack_from("<IQI", data, 4)
+        offset = 20
+        if version not in (1, self.VERSION):
             raise ValueError(f"Unsupported MPHF version: {version}")
 
-        num_domains = struct.unpack("<Q", data[offset : offset + 8])[0]
-        offset += 8
-
-        num_collisions = struct.unpack("<I", data[offset : offset + 4])[0]
-        offset += 4
-
-        # Parse hash map
-        self.hash_to_id = {}
-        self.domain_to_id = {}
-        for _ in range(num_domains - num_collisions):
-            hash_val = struct.unpack("<Q", data[offset : offset + 8])[0]
-            offset += 8
-
-            domain_id = struct.unpack("<I", data[offset : offset + 4])[0]
-            offset += 4
-
-            self.hash_to_id[hash_val] = domain_id
+        # Parse hash map (the arrays view the decompressed buffer, no copy)
+        if version == 1:
+            # Version 1 counted colliding hashes in num_entries and stored
+            # interleaved (hash, id) entries, already sorted by hash
+            num_hashes = num_entries - num_collisions
+            entries = np.frombuffer(
+                data, dtype=_V1_ENTRY_DTYPE, count=num_hashes, offset=offset
+            )
+            self.hashes = np.ascontiguousarray(entries["hash"])
+            self.ids = np.ascontiguousarray(entries["id"])
+            offset += num_hashes * _V1_ENTRY_DTYPE.itemsize
+        else:
+            num_hashes = num_entries
+            self.hashes = np.frombuffer(
+                data, dtype="<u8", count=num_hashes, offset=offset
+            )
+            offset += num_hashes * 8
+            self.ids = np.frombuffer(data, dtype="<u4", count=num_hashes, offset=offset)
+            offset += num_hashes * 4
 
         # Parse collision map
         self.collision_map = {}
         for _ in range(num_collisions):
-            hash_val = struct.unpack("<Q", data[offset : offset + 8])[0]
-            offset += 8
-
-            num_entries = struct.unpack("<H", data[offset : offset + 2])[0]
-            offset += 2
+            hash_val, num_entries = struct.unpack_from("<QH", data, offset)
+            offset += 10
 
             entries = []
             for _ in range(num_entries):
-                tag = struct.unpack("<H", data[offset : offset + 2])[0]
-                offset += 2
+                if version == 1:
+                    offset += 2  # 16-bit tag, superseded by the domain check
 
-                domain_len = struct.unpack("<H", data[offset : offset + 2])[0]
+                (domain_len,) = struct.unpack_from("<H", data, offset)
                 offset += 2
 
                 domain = data[offset : offset + domain_len].decode("utf-8")
                 offset += domain_len
 
-                domain_id = struct.unpack("<I", data[offset : offset + 4])[0]
+                (domain_id,) = struct.unpack_from("<I", data, offset)
                 offset += 4
 
-                entries.append((tag, domain, domain_id))
-                # Also populate domain_to_id for fast lookups
-                self.domain_to_id[domain] = domain_id
+                entries.append((domain, domain_id))
 
             self.collision_map[hash_val] = entries
-            # Mark hash as having collisions
-            self.hash_to_id[hash_val] = entries[0][2]  # Store first entry in hash_to_id
 
         logger.info(
-            f"Loaded MPHF: {num_domains} domains, "
-            f"{len(self.collision_map)} hash collisions"
+            f"Loaded MPHF: {num_hashes + sum(map(len, self.collision_map.values()))} "
+            f"domains, {len(self.collision_map)} hash collisions"
         )
 
     @staticmethod
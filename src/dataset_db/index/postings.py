@@ -9,14 +9,22 @@ Sharded by domain_id to keep files manageable.
 """
 
 import logging
+import os
 import struct
+import threading
+from collections import defaultdict, deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-import polars as pl
+import numpy as np
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 import zstandard as zstd
 
 from ..storage.layout import StorageLayout
+from .file_registry import _list_parquet_files, _parse_path, _relative_path
 
 logger = logging.getLogger(__name__)
 
@@ -50,6 +58,221 @@ def decode_varint(data: bytes, offset: int) -> tuple[int, int]:
     return result, offset
 
 
+def encode_varints(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encode an array of non-negative integers as concatenated varints.
+
+    Vectorized over the whole array: one numpy pass per varint byte position
+    (at most 10) instead of a Python loop per integer.
+
+    Args:
+        values: Integers to encode
+
+    Returns:
+        (encoded bytes as uint8 array, encoded length of each value)
+    """
+    values = np.asarray(values, dtype=np.uint64)
+    nbytes = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        nbytes += rest > 0
+        rest >>= np.uint64(7)
+
+    starts = np.cumsum(nbytes) - nbytes
+    out = np.empty(int(nbytes.sum()), dtype=np.uint8)
+    for k in range(int(nbytes.max(initial=0))):
+        has_byte = nbytes > k
+        low_bits = (values[has_byte] >> np.uint64(7 * k)) & np.uint64(0x7F)
+        continued = (nbytes[has_byte] > k + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[has_byte] + k] = low_bits | continued
+    return out, nbytes
+
+
+def decode_varints(data: bytes | memoryview) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Decode concatenated varints.
+
+    Args:
+        data: Encoded varints (trailing incomplete bytes are ignored)
+
+    Returns:
+        (decoded values as uint64 array, byte offset of each value in data)
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(buf < 0x80)
+    if len(ends) == 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=np.int64)
+
+    starts = np.empty(len(ends), dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    buf = buf[: ends[-1] + 1]
+
+    # Shift each byte by 7 × its position within its varint, then sum per varint
+    shifts = np.arange(len(buf)) - np.repeat(starts, ends - starts + 1)
+    parts = (buf & 0x7F).astype(np.uint64) << (shifts.astype(np.uint64) * 7)
+    return np.add.reduceat(parts, starts), starts
+
+
+def _read_row_group_domains(parquet_file: str | Path) -> list[list[str]]:
+    """
+    Read the unique domains of each row group of a Parquet file.
+
+    Args:
+        parquet_file: Path to a Parquet file with a domain column
+
+    Returns:
+        Unique domains per row group, indexed by row group
+    """
+    # Each row group's domain column is decoded once, on its own
+    row_group_domains = []
+    with pq.ParquetFile(parquet_file) as parquet:
+        for row_group_idx in range(parquet.num_row_groups):
+            table = parquet.read_row_group(row_group_idx, columns=["domain"])
+            row_group_domains.append(pc.unique(table.column("domain")).to_pylist())
+    return row_group_domains
+
+
+def _iter_row_group_domains(
+    tasks: list[tuple[str | Path, int, int]],
+) -> Iterator[tuple[tuple[str | Path, int, int], Future[list[list[str]]]]]:
+    """
+    Read Parquet files on a thread pool, yielding results in input order.
+
+    PyArrow releases the GIL while reading and decoding, so files
+    are read concurrently while the caller records postings. Read-ahead is
+    bounded to keep at most a few results per worker in memory.
+
+    Args:
+        tasks: (parquet_file, file_id, dataset_id) per file to read
+
+    Yields:
+        (task, future of _read_row_group_domains(parquet_file))
+    """
+    max_workers = min(32, (os.cpu_count() or 1) + 4)
+    pending: deque[tuple[tuple[Path, int, int], Future]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for task in tasks:
+            pending.append((task, executor.submit(_read_row_group_domains, task[0])))
+            if len(pending) >= 2 * max_workers:
+                yield pending.popleft()
+        while pending:
+            yield pending.popleft()
+
+
+_compressors = threading.local()
+
+
+def _write_compressed(path: Path, data: bytearray, compression_level: int) -> int:
+    """
+    Compress data with zstd and write it to path.
+
+    ZstdCompressor instances are not thread-safe, so each thread reuses its
+    own compressor (and context) per compression level.
+
+    Returns:
+        Compressed size in bytes
+    """
+    if not hasattr(_compressors, "by_level"):
+        _compressors.by_level = {}
+    compressor = _compressors.by_level.get(compression_level)
+    if compressor is None:
+        compressor = zstd.ZstdCompressor(level=compression_level)
+        _compressors.by_level[compression_level] = compressor
+
+    compressed = compressor.compress(data)
+    path.write_bytes(compressed)
+    return len(compressed)
+
+
+def _write_shards(
+    shards: Iterable[tuple[Path, int, bytearray, bytearray]],
+    idx_compression_level: int,
+    dat_compression_level: int,
+) -> Iterator[tuple[Path, int, int, int]]:
+    """
+    Compress and write serialized shards on a thread pool.
+
+    zstd releases the GIL while compressing, so compression and writes of
+    earlier shards overlap with serialization of the next ones. In-flight
+    shards are bounded to keep at most a few buffers per worker in memory.
+
+    Args:
+        shards: (shard_dir, num_entries, idx_data, dat_data) per shard
+        idx_compression_level: Zstd compression level of idx files
+        dat_compression_level: Zstd compression level of dat files
+
+    Yields:
+        (shard_dir, num_entries, idx_size, dat_size) per shard, in input order
+    """
+    max_workers = min(32, (os.cpu_count() or 1) + 4)
+    pending: deque[tuple[Path, int, Future[int], Future[int]]] = deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for shard_dir, num_entries, idx_data, dat_data in shards:
+            pending.append(
+                (
+                    shard_dir,
+                    num_entries,
+                    executor.submit(
+                        _write_compressed,
+                        shard_dir / "postings.idx.zst",
+                        idx_data,
+                        idx_compression_level,
+                    ),
+                    executor.submit(
+                        _write_compressed,
+                        shard_dir / "postings.dat.zst",
+                        dat_data,
+                        dat_compression_level,
+                    ),
+                )
+            )
+            if len(pending) >= 2 * max_workers:
+                shard_dir, num_entries, idx_size, dat_size = pending.popleft()
+                yield shard_dir, num_entries, idx_size.result(), dat_size.result()
+        while pending:
+            shard_dir, num_entries, idx_size, dat_size = pending.popleft()
+            yield shard_dir, num_entries, idx_size.result(), dat_size.result()
+
+
+class _ShardView:
+    """
+    Read-only view of one decompressed postings shard.
+
+    Keeps the idx entries as a record array over the decompressed buffer and
+    binary-searches them per lookup, instead of building a dict per entry.
+    """
+
+    def __init__(self, entries: np.ndarray, dat_data: bytes):
+        """
+        Initialize the view.
+
+        Args:
+            entries: Idx entries sorted by (domain_id, dataset_id)
+            dat_data: Decompressed dat file
+        """
+        self._entries = entries
+        self._domain_ids = np.ascontiguousarray(entries["domain_id"])
+        self._dat_data = dat_data
+
+    def get(self, domain_id: int, dataset_id: int) -> bytes | None:
+        """
+        Get the payload bytes for a (domain_id, dataset_id) pair.
+
+        Returns:
+            Payload bytes, or None if the pair has no postings
+        """
+        domain_ids = self._domain_ids
+        i = int(domain_ids.searchsorted(np.uint64(domain_id)))
+        # Entries of one domain are contiguous (one per dataset containing it)
+        while i < len(domain_ids) and domain_ids[i] == domain_id:
+            _, entry_dataset_id, payload_offset, payload_len = self._entries[i].item()
+            if entry_dataset_id == dataset_id:
+                return self._dat_data[payload_offset : payload_offset + payload_len]
+            i += 1
+        return None
+
+
 class PostingsIndex:
     """
     Build and query postings index for row-group lookups.
@@ -59,6 +282,21 @@ class PostingsIndex:
     VERSION = 1
     MAGIC_IDX = b"PDX1"
     MAGIC_DAT = b"PDD1"
+    # Varint payloads barely compress past level 1 (and zstd decompression
+    # speed does not depend on the level), so dat files use the fastest one
+    DAT_COMPRESSION_LEVEL = 1
+    # Decompressed shards kept for lookup()
+    SHARD_CACHE_SIZE = 128
+    # Index entry: {domain_id:uint64, dataset_id:uint32, payload_offset:uint64,
+    # payload_len:uint32}, packed
+    IDX_ENTRY_DTYPE = np.dtype(
+        [
+            ("domain_id", "<u8"),
+            ("dataset_id", "<u4"),
+            ("payload_offset", "<u8"),
+            ("payload_len", "<u4"),
+        ]
+    )
 
     def __init__(self, base_path: Path, num_shards: int = 1024):
         """
@@ -75,6 +313,10 @@ class PostingsIndex:
         # Postings data: (domain_id, dataset_id) → [(file_id, row_group), ...]
         self.postings: dict[tuple[int, int], list[tuple[int, int]]] = {}
 
+        self._cached_shard = lru_cache(maxsize=self.SHARD_CACHE_SIZE)(
+            self._load_shard_view
+        )
+
     def extract_postings(
         self, domain_lookup: dict[str, int], file_registry: dict[str, int]
     ) -> None:
@@ -97,90 +339,103 @@ class PostingsIndex:
             logger.warning(f"URLs directory does not exist: {urls_dir}")
             return
 
-        parquet_files = sorted(urls_dir.rglob("*.parquet"))
+        parquet_files = _list_parquet_files(str(urls_dir))
         if not parquet_files:
             logger.warning("No Parquet files found")
             return
 
         logger.info(f"Found {len(parquet_files)} Parquet files to scan")
 
-        for i, parquet_file in enumerate(parquet_files, 1):
+        self._collect_postings(
+            parquet_files, domain_lookup, file_registry, self.postings
+        )
+
+        logger.info(f"Extracted {len(self.postings)} posting entries")
+
+    def _collect_postings(
+        self,
+        parquet_files: list[str] | list[Path],
+        domain_lookup: dict[str, int],
+        file_registry: dict[str, int],
+        postings: dict[tuple[int, int], list[tuple[int, int]]],
+    ) -> None:
+        """
+        Add postings from Parquet files to a postings dict.
+
+        Files are read concurrently; results are recorded in input order, so
+        payloads list (file_id, row_group) pairs in the same order as a
+        sequential scan.
+
+        Args:
+            parquet_files: Parquet files under urls/
+            domain_lookup: Map from domain string to domain_id
+            file_registry: Map from relative file path to file_id
+            postings: (domain_id, dataset_id) → [(file_id, row_group), ...],
+                updated in place
+        """
+        root = str(self.base_path / "urls")
+
+        # Resolve file_id and dataset_id first, so skipped files are never read
+        tasks = []
+        for parquet_file in parquet_files:
+            # Get file_id
+            rel_path = _relative_path(str(parquet_file), root)
+            file_id = file_registry.get(rel_path)
+            if file_id is None:
+                logger.warning(f"File not in registry: {rel_path}")
+                continue
+
+            # Parse dataset_id from path
+            parsed = _parse_path(rel_path)
+            if parsed is None:
+                logger.warning(f"Could not extract dataset_id from {parquet_file}")
+                continue
+
+            tasks.append((parquet_file, file_id, parsed[0]))
+
+        for i, ((parquet_file, file_id, dataset_id), future) in enumerate(
+            _iter_row_group_domains(tasks), 1
+        ):
             if i % 100 == 0:
                 logger.info(
-                    f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(self.postings)} posting entries"
+                    f"Processed {i}/{len(tasks)} files, {len(postings)} posting entries"
                 )
 
             try:
-                # Get file_id
-                rel_path = str(parquet_file.relative_to(urls_dir))
-                file_id = file_registry.get(rel_path)
-                if file_id is None:
-                    logger.warning(f"File not in registry: {rel_path}")
-                    continue
-
-                # Parse dataset_id from path
-                parts = parquet_file.parts
-                dataset_id = None
-                for part in parts:
-                    if part.startswith("dataset_id="):
-                        dataset_id = int(part.split("=")[1])
-                        break
-
-                if dataset_id is None:
-                    logger.warning(f"Could not extract dataset_id from {parquet_file}")
-                    continue
-
-                # Read Parquet metadata
-                parquet_metadata = pq.read_metadata(parquet_file)
-                num_row_groups = parquet_metadata.num_row_groups
-
-                # For each row group, get unique domains
-                for row_group_idx in range(num_row_groups):
-                    # Read just the domain column for this row group
-                    # Note: PyArrow doesn't support reading single row groups easily,
-                    # so we'll read the whole file and filter by row group
-                    # For production, consider using lower-level APIs or caching
-                    df = pl.read_parquet(
-                        parquet_file,
-                        columns=["domain"],
-                        # Polars doesn't have direct row group filtering,
-                        # so we read all and accept the overhead for now
-                    )
-
-                    # For simplicity in this implementation, we'll record all domains
-                    # in the file for each row group. In production, you'd want to
-                    # read each row group separately to be more precise.
-                    unique_domains = df["domain"].unique().to_list()
-
-                    for domain in unique_domains:
-                        domain_id = domain_lookup.get(domain)
-                        if domain_id is None:
-                            continue
-
-                        key = (domain_id, dataset_id)
-                        if key not in self.postings:
-                            self.postings[key] = []
-
-                        self.postings[key].append((file_id, row_group_idx))
-
+                row_group_domains = future.result()
             except Exception as e:
                 logger.error(f"Error processing {parquet_file}: {e}")
                 continue
 
-        logger.info(f"Extracted {len(self.postings)} posting entries")
+            # For each row group, record its unique domains
+            for row_group_idx, unique_domains in enumerate(row_group_domains):
+                posting = (file_id, row_group_idx)
+                for domain in unique_domains:
+                    domain_id = domain_lookup.get(domain)
+                    if domain_id is None:
+                        continue
+
+                    # One dict probe per append
+                    postings.setdefault((domain_id, dataset_id), []).append(posting)
 
     def get_shard(self, domain_id: int) -> int:
         """Get shard number for a domain ID."""
         return domain_id % self.num_shards
 
-    def save(self, version: str, compression_level: int = 6) -> list[Path]:
+    def save(
+        self,
+        version: str,
+        compression_level: int = 6,
+        dat_compression_level: int | None = None,
+    ) -> list[Path]:
         """
         Save postings index to disk (sharded).
 
         Args:
             version: Version identifier
-            compression_level: Zstd compression level
+            compression_level: Zstd compression level of idx files
+            dat_compression_level: Zstd compression level of dat files
+                (defaults to DAT_COMPRESSION_LEVEL)
 
         Returns:
             List of paths to saved shard directories
@@ -189,22 +444,53 @@ class PostingsIndex:
             f"Saving postings index (version={version}, shards={self.num_shards})..."
         )
 
-        # Group postings by shard
-        shard_postings: dict[
+        # Group postings by shard (only populated shards get a list)
+        shard_postings: defaultdict[
             int, list[tuple[tuple[int, int], list[tuple[int, int]]]]
-        ] = {shard: [] for shard in range(self.num_shards)}
+        ] = defaultdict(list)
 
+        num_shards = self.num_shards
         for key, payload in sorted(self.postings.items()):
-            domain_id, dataset_id = key
-            shard = self.get_shard(domain_id)
-            shard_postings[shard].append((key, payload))
+            shard_postings[key[0] % num_shards].append((key, payload))
+
+        if dat_compression_level is None:
+            dat_compression_level = self.DAT_COMPRESSION_LEVEL
+
+        # Shards of this version are rewritten below
+        self._cached_shard.cache_clear()
 
-        # Write each shard
         saved_paths = []
-        for shard, postings_list in shard_postings.items():
-            if not postings_list:
-                continue  # Skip empty shards
+        for shard_dir, num_entries, idx_size, dat_size in _write_shards(
+            self._serialize_shards(version, shard_postings),
+            compression_level,
+            dat_compression_level,
+        ):
+            saved_paths.append(shard_dir)
+
+            logger.debug(
+                f"Shard {shard_dir.name}: {num_entries} entries, "
+                f"idx={idx_size:,} bytes, dat={dat_size:,} bytes"
+            )
 
+        logger.info(f"Saved postings index: {len(saved_paths)} shards")
+        return saved_paths
+
+    def _serialize_shards(
+        self,
+        version: str,
+        shard_postings: dict[int, list[tuple[tuple[int, int], list[tuple[int, int]]]]],
+    ) -> Iterator[tuple[Path, int, bytearray, bytearray]]:
+        """
+        Build the uncompressed idx and dat files of each shard, in shard order.
+
+        Args:
+            version: Version identifier
+            shard_postings: Sorted postings per non-empty shard
+
+        Yields:
+            (shard_dir, num_entries, idx_data, dat_data) per shard
+        """
+        for shard, postings_list in sorted(shard_postings.items()):
             shard_dir = self.base_path / "index" / version / "postings" / f"{shard:04d}"
             shard_dir.mkdir(parents=True, exist_ok=True)
 
@@ -212,6 +498,7 @@ class PostingsIndex:
             dat_data = bytearray()
             dat_data.extend(self.MAGIC_DAT)  # Magic
             dat_data.extend(struct.pack("<I", self.VERSION))  # Version
+            dat_header_size = len(dat_data)
 
             # Build .idx file (index)
             idx_data = bytearray()
@@ -223,69 +510,96 @@ class PostingsIndex:
             dat_offset_pos = len(idx_data)
             idx_data.extend(struct.pack("<Q", 0))
 
-            # Write payloads and index entries
-            for (domain_id, dataset_id), payload in postings_list:
-                # Encode payload: varint count, then varint pairs
-                payload_data = bytearray()
-                payload_data.extend(encode_varint(len(payload)))
-
-                for file_id, row_group in payload:
-                    payload_data.extend(encode_varint(file_id))
-                    payload_data.extend(encode_varint(row_group))
-
-                payload_offset = len(dat_data)
-                payload_len = len(payload_data)
-
-                dat_data.extend(payload_data)
-
-                # Write index entry
-                idx_data.extend(struct.pack("<Q", domain_id))  # Domain ID
-                idx_data.extend(struct.pack("<I", dataset_id))  # Dataset ID
-                idx_data.extend(struct.pack("<Q", payload_offset))  # Payload offset
-                idx_data.extend(struct.pack("<I", payload_len))  # Payload length
+            # Payloads are [count, file_id, row_group, file_id, ...] as varints;
+            # lay every payload of the shard out as one flat array and encode
+            # it in a single vectorized pass
+            counts = np.fromiter(
+                (len(payload) for _, payload in postings_list),
+                dtype=np.int64,
+                count=len(postings_list),
+            )
+            value_starts = np.arange(len(postings_list)) + 2 * (
+                np.cumsum(counts) - counts
+            )
+            values = np.empty(len(postings_list) + 2 * int(counts.sum()), np.uint64)
+            is_count = np.zeros(len(values), dtype=bool)
+            is_count[value_starts] = True
+            values[value_starts] = counts
+            values[~is_count] = [
+                value
+                for _, payload in postings_list
+                for pair in payload
+                for value in pair
+            ]
+
+            encoded, nbytes = encode_varints(values)
+            dat_data.extend(encoded.tobytes())
+
+            # Byte range of each payload within the encoded values
+            byte_starts = np.zeros(len(values) + 1, dtype=np.int64)
+            np.cumsum(nbytes, out=byte_starts[1:])
+            payload_bounds = byte_starts[np.append(value_starts, len(values))]
+
+            # Write index entries (one packed array)
+            entries = np.empty(len(postings_list), dtype=self.IDX_ENTRY_DTYPE)
+            entries["domain_id"] = [domain_id for (domain_id, _), _ in postings_list]
+            entries["dataset_id"] = [dataset_id for (_, dataset_id), _ in postings_list]
+            entries["payload_offset"] = dat_header_size + payload_bounds[:-1]
+            entries["payload_len"] = np.diff(payload_bounds)
+            idx_data.extend(entries.tobytes())
 
             # Update dat_offset in idx header
             dat_offset = len(self.MAGIC_DAT) + 4  # Magic + version
             struct.pack_into("<Q", idx_data, dat_offset_pos, dat_offset)
 
-            # Compress and write
-            compressor = zstd.ZstdCompressor(level=compression_level)
+            yield shard_dir, len(postings_list), idx_data, dat_data
 
-            idx_path = shard_dir / "postings.idx.zst"
-            idx_compressed = compressor.compress(bytes(idx_data))
-            idx_path.write_bytes(idx_compressed)
+    def load_shard(self, version: str, shard: int) -> dict[tuple[int, int], bytes]:
+        """
+        Load a single shard of postings index.
 
-            dat_path = shard_dir / "postings.dat.zst"
-            dat_compressed = compressor.compress(bytes(dat_data))
-            dat_path.write_bytes(dat_compressed)
+        Args:
+            version: Version identifier
+            shard: Shard number
 
-            saved_paths.append(shard_dir)
+        Returns:
+            Dict mapping (domain_id, dataset_id) to payload bytes
+        """
+        shard_data = self._read_shard(version, shard)
+        if shard_data is None:
+            return {}
 
-            logger.debug(
-                f"Shard {shard}: {len(postings_list)} entries, "
-                f"idx={len(idx_compressed):,} bytes, dat={len(dat_compressed):,} bytes"
+        entries, dat_data = shard_data
+        return {
+            (domain_id, dataset_id): dat_data[
+                payload_offset : payload_offset + payload_len
+            ]
+            for domain_id, dataset_id, payload_offset, payload_len in zip(
+                entries["domain_id"].tolist(),
+                entries["dataset_id"].tolist(),
+                entries["payload_offset"].tolist(),
+                entries["payload_len"].tolist(),
             )
+        }
 
-        logger.info(f"Saved postings index: {len(saved_paths)} shards")
-        return saved_paths
-
-    def load_shard(self, version: str, shard: int) -> dict[tuple[int, int], bytes]:
+    def _read_shard(self, version: str, shard: int) -> tuple[np.ndarray, bytes] | None:
         """
-        Load a single shard of postings index.
+        Read and decompress a shard's idx and dat files.
 
         Args:
             version: Version identifier
             shard: Shard number
 
         Returns:
-            Dict mapping (domain_id, dataset_id) to payload bytes
+            (idx entries as IDX_ENTRY_DTYPE array, decompressed dat bytes), or
+            None if the shard does not exist
         """
         shard_dir = self.base_path / "index" / version / "postings" / f"{shard:04d}"
         idx_path = shard_dir / "postings.idx.zst"
         dat_path = shard_dir / "postings.dat.zst"
 
         if not idx_path.exists() or not dat_path.exists():
-            return {}
+            return None
 
         # Decompress
         decompressor = zstd.ZstdDecompressor()
@@ -294,43 +608,19 @@ class PostingsIndex:
         dat_data = decompressor.decompress(dat_path.read_bytes())
 
         # Parse idx header
-        offset = 0
-
-        magic = idx_data[offset : offset + 4]
-        offset += 4
+        magic = idx_data[0:4]
         if magic != self.MAGIC_IDX:
             raise ValueError(f"Invalid postings idx: bad magic {magic}")
 
-        version_num = struct.unpack("<I", idx_data[offset : offset + 4])[0]
-        offset += 4
+        version_num, n_entries, _dat_offset = struct.unpack_from("<IQQ", idx_data, 4)
         if version_num != self.VERSION:
             raise ValueError(f"Unsupported postings idx version: {version_num}")
 
-        n_entries = struct.unpack("<Q", idx_data[offset : offset + 8])[0]
-        offset += 8
-
-        _dat_offset = struct.unpack("<Q", idx_data[offset : offset + 8])[0]  # noqa: F841
-        offset += 8
-
-        # Parse entries
-        result = {}
-        for _ in range(n_entries):
-            domain_id = struct.unpack("<Q", idx_data[offset : offset + 8])[0]
-            offset += 8
-
-            dataset_id = struct.unpack("<I", idx_data[offset : offset + 4])[0]
-            offset += 4
-
-            payload_offset = struct.unpack("<Q", idx_data[offset : offset + 8])[0]
-            offset += 8
-
-            payload_len = struct.unpack("<I", idx_data[offset : offset + 4])[0]
-            offset += 4
-
-            payload_bytes = dat_data[payload_offset : payload_offset + payload_len]
-            result[(domain_id, dataset_id)] = payload_bytes
-
-        return result
+        # Parse entries (one vectorized parse of the fixed-width records)
+        entries = np.frombuffer(
+            idx_data, dtype=self.IDX_ENTRY_DTYPE, count=n_entries, offset=24
+        )
+        return entries, dat_data
 
     def decode_payload(self, payload_bytes: bytes) -> list[tuple[int, int]]:
         """
@@ -342,16 +632,9 @@ class PostingsIndex:
         Returns:
             List of (file_id, row_group) tuples
         """
-        offset = 0
-        count, offset = decode_varint(payload_bytes, offset)
-
-        result = []
-        for _ in range(count):
-            file_id, offset = decode_varint(payload_bytes, offset)
-            row_group, offset = decode_varint(payload_bytes, offset)
-            result.append((file_id, row_group))
-
-        return result
+        values = decode_varints(payload_bytes)[0].tolist()
+        count = values[0]
+        return list(zip(values[1 : 2 * count : 2], values[2 : 2 * count + 1 : 2]))
 
     def lookup(
         self, version: str, domain_id: int, dataset_id: int
@@ -368,14 +651,23 @@ class PostingsIndex:
             List of (file_id, row_group) tuples
         """
         shard = self.get_shard(domain_id)
-        shard_data = self.load_shard(version, shard)
+        shard_view = self._cached_shard(version, shard)
+        if shard_view is None:
+            return []
 
-        payload_bytes = shard_data.get((domain_id, dataset_id))
+        payload_bytes = shard_view.get(domain_id, dataset_id)
         if payload_bytes is None:
             return []
 
         return self.decode_payload(payload_bytes)
 
+    def _load_shard_view(self, version: str, shard: int) -> _ShardView | None:
+        """Read a shard into a _ShardView (None if the shard does not exist)."""
+        shard_data = self._read_shard(version, shard)
+        if shard_data is None:
+            return None
+        return _ShardView(*shard_data)
+
     def build(
         self,
         domain_lookup: dict[str, int],
@@ -417,60 +709,8 @@ class PostingsIndex:
         """
         logger.info(f"Extracting postings from {len(parquet_files)} Parquet files...")
 
-        urls_dir = self.base_path / "urls"
         postings: dict[tuple[int, int], list[tuple[int, int]]] = {}
-
-        for i, parquet_file in enumerate(parquet_files, 1):
-            if i % 100 == 0:
-                logger.info(
-                    f"Processed {i}/{len(parquet_files)} files, "
-                    f"{len(postings)} posting entries"
-                )
-
-            try:
-                # Get file_id
-                rel_path = str(parquet_file.relative_to(urls_dir))
-                file_id = file_registry.get(rel_path)
-                if file_id is None:
-                    logger.warning(f"File not in registry: {rel_path}")
-                    continue
-
-                # Parse dataset_id from path
-                parts = parquet_file.parts
-                dataset_id = None
-                for part in parts:
-                    if part.startswith("dataset_id="):
-                        dataset_id = int(part.split("=")[1])
-                        break
-
-                if dataset_id is None:
-                    logger.warning(f"Could not extract dataset_id from {parquet_file}")
-                    continue
-
-                # Read Parquet metadata
-                parquet_metadata = pq.read_metadata(parquet_file)
-                num_row_groups = parquet_metadata.num_row_groups
-
-                # For each row group, get unique domains
-                for row_group_idx in range(num_row_groups):
-                    # Read domain column (simplified: reads whole file)
-                    df = pl.read_parquet(parquet_file, columns=["domain"])
-                    unique_domains = df["domain"].unique().to_list()
-
-                    for domain in unique_domains:
-                        domain_id = domain_lookup.get(domain)
-                        if domain_id is None:
-                            continue
-
-                        key = (domain_id, dataset_id)
-                        if key not in postings:
-                            postings[key] = []
-
-                        postings[key].append((file_id, row_group_idx))
-
-            except Exception as e:
-                logger.error(f"Error processing {parquet_file}: {e}")
-                continue
+        self._collect_postings(parquet_files, domain_lookup, file_registry, postings)
 
         logger.info(f"Extracted {len(postings)} posting entries from new files")
         return postings
@@ -544,12 +784,32 @@ class PostingsIndex:
 
         for shard_dir in shard_dirs:
             shard = int(shard_dir.name)
-            shard_data = self.load_shard(version, shard)
+            shard_data = self._read_shard(version, shard)
+            if shard_data is None:
+                continue
 
-            # Decode payloads
-            for (domain_id, dataset_id), payload_bytes in shard_data.items():
-                pairs = self.decode_payload(payload_bytes)
-                all_postings[(domain_id, dataset_id)] = pairs
+            # Decode every payload in the shard with one vectorized pass, then
+            # slice each entry's [count, file_id, row_group, ...] values
+            entries, dat_data = shard_data
+            dat_header_size = len(self.MAGIC_DAT) + 4  # Magic + version
+            values, value_offsets = decode_varints(
+                memoryview(dat_data)[dat_header_size:]
+            )
+            value_starts = np.searchsorted(
+                value_offsets,
+                entries["payload_offset"].astype(np.int64) - dat_header_size,
+            ).tolist()
+            values = values.tolist()
+
+            for domain_id, dataset_id, start in zip(
+                entries["domain_id"].tolist(),
+                entries["dataset_id"].tolist(),
+                value_starts,
+            ):
+                end = start + 2 * values[start]
+                all_postings[(domain_id, dataset_id)] = list(
+                    zip(values[start + 1 : end : 2], values[start + 2 : end + 1 : 2])
+                )
 
         logger.info(f"Loaded {len(all_postings)} posting entries from all shards")
         return all_postings
@@ -3,6 +3,12 @@ Persistent dataset registry for assigning stable dataset IDs.
 
 Ensures dataset IDs are consistent across ingestion runs by storing the
 mapping on disk under the configured storage base path (./data by default).
+
+The registry file is JSONL with one {"n": name, "i": dataset_id} line per
+registration, so registering a dataset appends one line instead of
+rewriting the whole mapping. Registries in the original single-document JSON
+format are read and rewritten as JSONL, and the old file is kept as
+dataset_registry.json.bak.
 """
 
 from __future__ import annotations
@@ -10,7 +16,6 @@ from __future__ import annotations
 import json
 import logging
 from pathlib import Path
-from typing import Dict
 
 from dataset_db.config import get_config
 
@@ -38,46 +43,88 @@ class DatasetRegistry:
         if registry_path is not None:
             self.registry_path = Path(registry_path)
         else:
-            self.registry_path = self.base_path / "registry" / "dataset_registry.json"
+            self.registry_path = self.base_path / "registry" / "dataset_registry.jsonl"
 
         self.registry_path.parent.mkdir(parents=True, exist_ok=True)
 
-        self._datasets: Dict[str, int] = {}
+        self._datasets: dict[str, int] = {}
         self._next_dataset_id = 0
+        # Lines in the registry file (compacted when mostly redundant)
+        self._line_count = 0
 
         self._load()
 
     def _load(self) -> None:
         """Load registry contents from disk if present."""
-        if not self.registry_path.exists():
+        path = self.registry_path
+        if not path.exists():
+            # Registries written before the JSONL format
+            path = self.registry_path.with_suffix(".json")
+            if path == self.registry_path or not path.exists():
+                return
+
+        text = path.read_text()
+        datasets = self._parse_legacy(text)
+        if datasets is not None:
+            self._datasets = datasets
+            self._next_dataset_id = max(datasets.values(), default=-1) + 1
+            self.compact()
+            if path != self.registry_path:
+                # Keep the migrated file as a backup, out of the lookup path
+                path.replace(path.with_suffix(".json.bak"))
+                logger.info("Migrated dataset registry %s to JSONL", path)
             return
 
-        try:
-            data = json.loads(self.registry_path.read_text())
-        except json.JSONDecodeError as exc:
+        malformed = 0
+        for line in text.splitlines():
+            try:
+                entry = json.loads(line)
+                name, dataset_id = str(entry["n"]), int(entry["i"])
+            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+                # e.g. a partial line left by an interrupted write
+                malformed += 1
+                continue
+            self._datasets.setdefault(name, dataset_id)
+            self._line_count += 1
+
+        self._next_dataset_id = max(self._datasets.values(), default=-1) + 1
+
+        if malformed:
             logger.warning(
-                "Failed to parse dataset registry %s: %s. Recreating from scratch.",
-                self.registry_path,
-                exc,
+                "Skipped %s malformed lines in dataset registry %s",
+                malformed,
+                path,
             )
-            return
-
-        datasets = data.get("datasets", {})
-        self._datasets = {str(name): int(ds_id) for name, ds_id in datasets.items()}
-
-        next_from_file = int(data.get("next_dataset_id", len(self._datasets)))
-        max_existing = max(self._datasets.values(), default=-1) + 1
-        self._next_dataset_id = max(next_from_file, max_existing)
-
-    def _save(self) -> None:
-        """Persist registry contents atomically."""
-        payload = {
-            "next_dataset_id": self._next_dataset_id,
-            "datasets": self._datasets,
-        }
+        # Rewrite so appends never land after a partial line, and drop
+        # duplicate lines once they outnumber the datasets
+        partial = bool(text) and not text.endswith("\n")
+        if malformed or partial or self._line_count > 2 * len(self._datasets):
+            self.compact()
+
+    @staticmethod
+    def _parse_legacy(text: str) -> dict[str, int] | None:
+        """Parse a single-document JSON registry, or return None if not one."""
+        try:
+            data = json.loads(text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict) or "datasets" not in data:
+            return None
+        return {str(name): int(ds_id) for name, ds_id in data["datasets"].items()}
+
+    def compact(self) -> None:
+        """Rewrite the registry file atomically with one line per dataset."""
         tmp_path = self.registry_path.with_suffix(".tmp")
-        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True))
+        tmp_path.write_text(
+            "".join(
+                json.dumps({"n": name, "i": dataset_id}) + "\n"
+                for name, dataset_id in sorted(
+                    self._datasets.items(), key=lambda item: item[1]
+                )
+            )
+        )
         tmp_path.replace(self.registry_path)
+        self._line_count = len(self._datasets)
 
     def register_dataset(self, dataset_name: str) -> int:
         """
@@ -101,7 +148,9 @@ class DatasetRegistry:
 
         self._datasets[dataset_name] = dataset_id
         self._next_dataset_id += 1
-        self._save()
+        with self.registry_path.open("a") as f:
+            f.write(json.dumps({"n": dataset_name, "i": dataset_id}) + "\n")
+        self._line_count += 1
         logger.debug("Registered dataset '%s' with id %s", dataset_name, dataset_id)
         return dataset_id
 
@@ -109,7 +158,7 @@ class DatasetRegistry:
         """Look up an existing dataset ID."""
         return self._datasets[dataset_name]
 
-    def to_dict(self) -> Dict[str, int]:
+    def to_dict(self) -> dict[str, int]:
         """Return a copy of the dataset mapping."""
         return dict(self._datasets)
 
@@ -117,5 +166,6 @@ class DatasetRegistry:
         """Clear the registry contents (primarily for testing)."""
         self._datasets.clear()
         self._next_dataset_id = 0
+        self._line_count = 0
         if self.registry_path.exists():
             self.registry_path.unlink()
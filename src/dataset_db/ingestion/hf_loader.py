@@ -6,6 +6,8 @@ Loads datasets from HuggingFace Hub with the format:
 """
 
 import json
+import logging
+import os
 from pathlib import Path
 from typing import Iterator, Optional
 
@@ -14,6 +16,8 @@ from datasets import load_dataset
 
 from dataset_db.config import get_config
 
+logger = logging.getLogger(__name__)
+
 
 class HuggingFaceLoader:
     """
@@ -24,6 +28,11 @@ class HuggingFaceLoader:
     - domain: string (top-level domain)
     """
 
+    # Marks state dicts saved while streaming Arrow batches. Resume state is
+    # specific to how the dataset was iterated, so state dicts without it
+    # (saved by the original record-by-record iterator) resume that way.
+    ARROW_STATE_KEY = "arrow_batches"
+
     def __init__(
         self,
         username: str = "nhagar",
@@ -71,18 +80,31 @@ class HuggingFaceLoader:
                 streaming=True,
             )
 
+            state_dict = self.load_state_dict(dataset_name) if resume else None
+            arrow = state_dict is None or state_dict.pop(self.ARROW_STATE_KEY, False)
+
+            # Format before resuming: with_format() drops loaded state
+            if arrow:
+                dataset = dataset.with_format("arrow")
+
             # Resume from saved state if requested
-            if resume:
-                state_dict = self.load_state_dict(dataset_name)
-                if state_dict is not None:
-                    dataset.load_state_dict(state_dict)
+            if state_dict is not None:
+                dataset.load_state_dict(state_dict)
 
             # Store dataset for state dict access
             self._current_dataset = dataset
             self._current_dataset_name = dataset_name
+            self._current_arrow_batches = arrow
 
             # Yield batches from streaming dataset
-            yield from self._stream_batches(dataset, batch_size=self.batch_size)
+            if arrow:
+                yield from self._stream_batches(dataset, batch_size=self.batch_size)
+            else:
+                logger.info(
+                    f"Resuming {full_name} from a record-level state dict; "
+                    "streaming records instead of Arrow batches"
+                )
+                yield from self._stream_records(dataset, batch_size=self.batch_size)
 
         except Exception as e:
             raise ValueError(f"Failed to load dataset '{full_name}': {e}")
@@ -134,9 +156,16 @@ class HuggingFaceLoader:
             raise RuntimeError("No dataset currently loaded")
 
         state_dict = self._current_dataset.state_dict()
+        if self._current_arrow_batches:
+            state_dict[self.ARROW_STATE_KEY] = True
         state_path = self.get_state_dict_path(dataset_name)
-        with open(state_path, "w") as f:
+
+        # Write to a temp file and rename, so a crash mid-write never leaves
+        # a torn state dict behind
+        tmp_path = state_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w") as f:
             json.dump(state_dict, f)
+        os.replace(tmp_path, state_path)
 
     def clear_state_dict(self, dataset_name: str) -> None:
         """
@@ -153,7 +182,26 @@ class HuggingFaceLoader:
 
     def _stream_batches(self, dataset, batch_size: int) -> Iterator[pl.DataFrame]:
         """
-        Stream batches from HuggingFace dataset.
+        Stream batches from an Arrow-formatted HuggingFace dataset.
+
+        Each batch arrives as a pyarrow Table and is adopted by Polars without
+        building a Python object per record.
+
+        Args:
+            dataset: HuggingFace streaming dataset with format "arrow"
+            batch_size: Number of records per batch
+
+        Yields:
+            Polars DataFrames with batches
+        """
+        for table in dataset.iter(batch_size=batch_size):
+            yield pl.from_arrow(table)
+
+    def _stream_records(self, dataset, batch_size: int) -> Iterator[pl.DataFrame]:
+        """
+        Stream batches from HuggingFace dataset record by record.
+
+        Only used to resume from state dicts saved by this iterator.
 
         Args:
             dataset: HuggingFace streaming dataset
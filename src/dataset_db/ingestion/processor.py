@@ -4,7 +4,9 @@ Ingestion processor pipeline.
 Processes raw URL datasets through normalization and prepares for Parquet storage.
 """
 
-from typing import Optional
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import ClassVar, Self
 
 import polars as pl
 
@@ -13,6 +15,60 @@ from dataset_db.normalization import IDGenerator, URLNormalizer
 
 from .dataset_registry import DatasetRegistry
 
+# Normalized columns: (raw_url, scheme, host, path_query, domain)
+NormalizedColumns = tuple[list[str], list[str], list[str], list[str], list[str]]
+
+# Normalizer of a worker process (set by _init_worker)
+_worker_normalizer: URLNormalizer | None = None
+
+
+def _normalize_urls(normalizer: URLNormalizer, urls: list[str]) -> NormalizedColumns:
+    """
+    Normalize URLs, collecting each output column as a list.
+
+    URLs that fail to normalize are skipped.
+
+    Args:
+        normalizer: URL normalizer
+        urls: Raw URLs (non-empty)
+
+    Returns:
+        (raw_urls, schemes, hosts, path_queries, domains) of the kept URLs
+    """
+    raw_urls: list[str] = []
+    schemes: list[str] = []
+    hosts: list[str] = []
+    path_queries: list[str] = []
+    domains: list[str] = []
+
+    for raw_url in urls:
+        try:
+            norm = normalizer.normalize(raw_url)
+        except (ValueError, Exception) as e:
+            # Log error but continue processing
+            # In production, you'd want proper logging here
+            print(f"Warning: Failed to normalize URL '{raw_url}': {e}")
+            continue
+
+        raw_urls.append(raw_url)
+        schemes.append(norm.scheme)
+        hosts.append(norm.host)
+        path_queries.append(norm.get_path_query())
+        domains.append(norm.domain)
+
+    return raw_urls, schemes, hosts, path_queries, domains
+
+
+def _init_worker(normalizer: URLNormalizer) -> None:
+    """Store the normalizer in a worker process."""
+    global _worker_normalizer
+    _worker_normalizer = normalizer
+
+
+def _normalize_chunk(urls: list[str]) -> NormalizedColumns:
+    """Normalize a chunk of URLs in a worker process."""
+    return _normalize_urls(_worker_normalizer, urls)
+
 
 class IngestionProcessor:
     """
@@ -22,11 +78,28 @@ class IngestionProcessor:
     for Parquet storage with schema from spec.md §2.1.
     """
 
+    # Batches smaller than this are normalized in-process
+    MIN_PARALLEL_URLS = 50_000
+    # Chunks per worker (smaller chunks balance uneven URLs across workers)
+    CHUNKS_PER_WORKER = 4
+
+    # Output columns and types (spec.md §2.1)
+    OUTPUT_SCHEMA: ClassVar[dict[str, pl.DataType]] = {
+        "dataset_id": pl.Int32,
+        "domain_id": pl.Int64,
+        "url_id": pl.Int64,
+        "scheme": pl.Utf8,
+        "host": pl.Utf8,
+        "path_query": pl.Utf8,
+        "domain": pl.Utf8,
+        "domain_prefix": pl.Utf8,
+    }
+
     def __init__(
         self,
-        normalizer: Optional[URLNormalizer] = None,
-        id_generator: Optional[IDGenerator] = None,
-        dataset_registry: Optional[DatasetRegistry] = None,
+        normalizer: URLNormalizer | None = None,
+        id_generator: IDGenerator | None = None,
+        dataset_registry: DatasetRegistry | None = None,
     ):
         """
         Initialize ingestion processor.
@@ -41,6 +114,7 @@ class IngestionProcessor:
         self.dataset_registry = dataset_registry or DatasetRegistry()
         self._processed_datasets: dict[str, int] = {}
         self.config = get_config()
+        self._pool: ProcessPoolExecutor | None = None
 
     def process_batch(self, df: pl.DataFrame, dataset_name: str) -> pl.DataFrame:
         """
@@ -70,81 +144,98 @@ class IngestionProcessor:
         dataset_id = self.dataset_registry.register_dataset(dataset_name)
         self._processed_datasets[dataset_name] = dataset_id
 
-        # Process each URL through normalizer
-        normalized_records = []
-
-        for row in df.iter_rows(named=True):
-            raw_url = row.get("url", "")
-
-            if not raw_url:
-                continue  # Skip empty URLs
-
-            try:
-                norm = self.normalizer.normalize(raw_url)
-
-                # Generate IDs
-                url_id = self.id_generator.get_url_id(raw_url)
-                domain_id = self.id_generator.get_domain_id(norm.domain)
-
-                normalized_records.append(
-                    {
-                        "dataset_id": dataset_id,
-                        "domain_id": domain_id,
-                        "url_id": url_id,
-                        "scheme": norm.scheme,
-                        "host": norm.host,
-                        "path_query": norm.get_path_query(),
-                        "domain": norm.domain,
-                        "domain_prefix": self.id_generator.get_domain_prefix(
-                            norm.domain,
-                            self.config.storage.domain_prefix_chars,
-                        ),
-                    }
-                )
-
-            except (ValueError, Exception) as e:
-                # Log error but continue processing
-                # In production, you'd want proper logging here
-                print(f"Warning: Failed to normalize URL '{raw_url}': {e}")
-                continue
-
-        # Convert to Polars DataFrame with proper types
-        if not normalized_records:
+        if "url" not in df.columns:
+            return self._empty_dataframe()
+
+        # Skip null and empty URLs in one vectorized pass
+        urls = df.get_column("url").cast(pl.Utf8)
+        urls = urls.filter(urls.is_not_null() & (urls.str.len_bytes() > 0))
+
+        raw_urls, schemes, hosts, path_queries, domains = self._normalize(
+            urls.to_list()
+        )
+
+        if not raw_urls:
             # Return empty DataFrame with correct schema
             return self._empty_dataframe()
 
-        result_df = pl.DataFrame(normalized_records)
-
-        # Ensure correct types
-        result_df = result_df.with_columns(
-            [
-                pl.col("dataset_id").cast(pl.Int32),
-                pl.col("domain_id").cast(pl.Int64),
-                pl.col("url_id").cast(pl.Int64),
-                pl.col("scheme").cast(pl.Utf8),
-                pl.col("host").cast(pl.Utf8),
-                pl.col("path_query").cast(pl.Utf8),
-                pl.col("domain").cast(pl.Utf8),
-                pl.col("domain_prefix").cast(pl.Utf8),
-            ]
+        # Generate IDs
+        id_generator = self.id_generator
+        prefix_chars = self.config.storage.domain_prefix_chars
+
+        return pl.DataFrame(
+            {
+                "dataset_id": pl.repeat(
+                    dataset_id, len(raw_urls), dtype=pl.Int32, eager=True
+                ),
+                "domain_id": id_generator.get_domain_ids(domains),
+                "url_id": id_generator.get_url_ids(raw_urls),
+                "scheme": schemes,
+                "host": hosts,
+                "path_query": path_queries,
+                "domain": domains,
+                "domain_prefix": id_generator.get_domain_prefixes(
+                    domains, prefix_chars
+                ),
+            },
+            schema=self.OUTPUT_SCHEMA,
         )
 
-        return result_df
+    def _normalize(self, urls: list[str]) -> NormalizedColumns:
+        """
+        Normalize a batch of URLs, on worker processes for large batches.
+
+        Normalization is pure Python and holds the GIL, so large batches are
+        split into chunks and normalized on a process pool of
+        config.ingestion.max_workers processes. Chunk results are
+        concatenated in input order.
+
+        Args:
+            urls: Raw URLs (non-empty)
+
+        Returns:
+            (raw_urls, schemes, hosts, path_queries, domains) of the kept URLs
+        """
+        max_workers = self.config.ingestion.max_workers
+        if max_workers <= 1 or len(urls) < self.MIN_PARALLEL_URLS:
+            return _normalize_urls(self.normalizer, urls)
+
+        if self._pool is None:
+            # Spawn rather than fork: forking a process that runs Polars
+            # threads can deadlock
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.normalizer,),
+            )
+
+        chunk_size = -(-len(urls) // (max_workers * self.CHUNKS_PER_WORKER))
+        chunks = [urls[i : i + chunk_size] for i in range(0, len(urls), chunk_size)]
+
+        columns: NormalizedColumns = ([], [], [], [], [])
+        for chunk_columns in self._pool.map(_normalize_chunk, chunks):
+            for column, chunk_column in zip(columns, chunk_columns):
+                column.extend(chunk_column)
+        return columns
+
+    def close(self) -> None:
+        """Shut down the normalization worker processes, if started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self) -> Self:
+        """Use as a context manager that calls close() on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut down the worker processes when leaving the context."""
+        self.close()
 
     def _empty_dataframe(self) -> pl.DataFrame:
         """Create empty DataFrame with correct schema."""
-        return pl.DataFrame(
-            schema={
-                "dataset_id": pl.Int32,
-                "domain_id": pl.Int64,
-                "url_id": pl.Int64,
-                "scheme": pl.Utf8,
-                "host": pl.Utf8,
-                "path_query": pl.Utf8,
-                "domain": pl.Utf8,
-                "domain_prefix": pl.Utf8,
-            }
-        )
+        return pl.DataFrame(schema=self.OUTPUT_SCHEMA)
 
     def get_stats(self) -> dict:
         """
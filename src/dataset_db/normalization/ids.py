@@ -7,11 +7,45 @@ Implements the ID schemes from spec.md §1.2:
 - url_id: xxh3_64(raw_url_bytes)
 """
 
-from typing import Dict
+from collections.abc import Sequence
+from functools import lru_cache
 
+import numpy as np
 import xxhash
 
 
+def _hash64(values: Sequence[str]) -> np.ndarray:
+    """
+    Compute xxh3_64 hashes of UTF-8 encoded strings.
+
+    Chained map() calls keep the per-string encode and hash in C, with no
+    Python frame per string.
+
+    Returns:
+        uint64 array of hashes, one per value
+    """
+    return np.fromiter(
+        map(xxhash.xxh3_64_intdigest, map(str.encode, values)),
+        dtype=np.uint64,
+        count=len(values),
+    )
+
+
+def _domain_hash(domain: str) -> tuple[int, str]:
+    """
+    Compute the xxh3_64 hash of a domain in both forms the scalar methods use.
+
+    Returns:
+        Tuple of (hash as signed int64, hash as 16 hex chars)
+    """
+    hash_val = xxhash.xxh3_64_intdigest(domain.encode("utf-8"))
+    hex_str = f"{hash_val:016x}"
+    # Convert to signed int64 range
+    if hash_val >= 2**63:
+        hash_val -= 2**64
+    return hash_val, hex_str
+
+
 class IDGenerator:
     """
     Generate IDs for URLs, domains, and datasets.
@@ -20,10 +54,16 @@ class IDGenerator:
     will be generated during index building phase.
     """
 
+    # Domains cached by the scalar get_domain_id()/get_domain_prefix()
+    DOMAIN_HASH_CACHE_SIZE = 65536
+
     def __init__(self):
         """Initialize ID generator."""
-        self._dataset_registry: Dict[str, int] = {}
+        self._dataset_registry: dict[str, int] = {}
         self._next_dataset_id = 0
+        # Domains repeat across URLs, and an ID is usually followed by a
+        # prefix for the same domain
+        self._domain_hash = lru_cache(maxsize=self.DOMAIN_HASH_CACHE_SIZE)(_domain_hash)
 
     def get_url_id(self, url: str) -> int:
         """
@@ -36,7 +76,7 @@ class IDGenerator:
             64-bit hash as signed int64 (for Parquet compatibility)
         """
         # xxhash returns unsigned, we'll store as signed int64 in Parquet
-        hash_val = xxhash.xxh3_64(url.encode("utf-8")).intdigest()
+        hash_val = xxhash.xxh3_64_intdigest(url.encode("utf-8"))
         # Convert to signed int64 range
         if hash_val >= 2**63:
             hash_val -= 2**64
@@ -55,11 +95,7 @@ class IDGenerator:
         Returns:
             64-bit hash as signed int64
         """
-        hash_val = xxhash.xxh3_64(domain.encode("utf-8")).intdigest()
-        # Convert to signed int64 range
-        if hash_val >= 2**63:
-            hash_val -= 2**64
-        return hash_val
+        return self._domain_hash(domain)[0]
 
     def get_domain_prefix(self, domain: str, prefix_chars: int = 2) -> str:
         """
@@ -72,10 +108,56 @@ class IDGenerator:
         Returns:
             Hex prefix string (e.g., 'a7', '3f')
         """
-        hash_val = xxhash.xxh3_64(domain.encode("utf-8")).intdigest()
         # Get first N hex chars
-        hex_str = f"{hash_val:016x}"
-        return hex_str[:prefix_chars]
+        return self._domain_hash(domain)[1][:prefix_chars]
+
+    def get_url_ids(self, urls: Sequence[str]) -> np.ndarray:
+        """
+        Generate URL IDs for many URLs at once (batch form of get_url_id).
+
+        Args:
+            urls: Raw URL strings
+
+        Returns:
+            int64 array of URL IDs, aligned with urls
+        """
+        # Reinterpreting the bits gives the same signed values as get_url_id
+        return _hash64(urls).view(np.int64)
+
+    def get_domain_ids(self, domains: Sequence[str]) -> np.ndarray:
+        """
+        Generate domain IDs for many domains at once (batch form of get_domain_id).
+
+        Args:
+            domains: Normalized domain strings (eTLD+1)
+
+        Returns:
+            int64 array of domain IDs, aligned with domains
+        """
+        return _hash64(domains).view(np.int64)
+
+    def get_domain_prefixes(
+        self, domains: Sequence[str], prefix_chars: int = 2
+    ) -> list[str]:
+        """
+        Get partition prefixes for many domains (batch form of get_domain_prefix).
+
+        Args:
+            domains: Normalized domain strings
+            prefix_chars: Number of hex characters to use (default: 2)
+
+        Returns:
+            Hex prefix strings, aligned with domains
+        """
+        hashes = _hash64(domains)
+        if not 1 <= prefix_chars <= 4:
+            return [f"{hash_val:016x}"[:prefix_chars] for hash_val in hashes.tolist()]
+
+        # The leading hex chars are the top 4 * prefix_chars bits of the hash,
+        # mapped through a table of every possible prefix
+        prefixes = (hashes >> np.uint64(64 - 4 * prefix_chars)).tolist()
+        table = [f"{prefix:0{prefix_chars}x}" for prefix in range(16**prefix_chars)]
+        return [table[prefix] for prefix in prefixes]
 
     def register_dataset(self, dataset_name: str) -> int:
         """
@@ -116,7 +198,7 @@ class IDGenerator:
             raise KeyError(f"Dataset '{dataset_name}' not registered")
         return self._dataset_registry[dataset_name]
 
-    def get_all_datasets(self) -> Dict[str, int]:
+    def get_all_datasets(self) -> dict[str, int]:
         """Get all registered datasets."""
         return self._dataset_registry.copy()
 
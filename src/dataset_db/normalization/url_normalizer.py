@@ -9,6 +9,7 @@ Implements the normalization strategy from spec.md §1.1:
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import parse_qs, urlencode, urlparse, urlunparse
 
@@ -72,9 +73,30 @@ class URLNormalizer:
         "ftps": 990,
     }
 
+    # Hosts whose eTLD+1 is kept in the per-instance lookup cache
+    DOMAIN_CACHE_SIZE = 65536
+
     def __init__(self):
         """Initialize normalizer with Public Suffix List."""
         self.psl = PublicSuffixList()
+        # Hosts repeat heavily across URLs, and the PSL walk is the costliest
+        # per-host step
+        self._cached_domain = lru_cache(maxsize=self.DOMAIN_CACHE_SIZE)(
+            self._extract_domain
+        )
+
+    def __getstate__(self) -> dict:
+        """Pickle without the domain cache (sent to ingestion workers)."""
+        state = self.__dict__.copy()
+        del state["_cached_domain"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Restore from pickle with an empty domain cache."""
+        self.__dict__.update(state)
+        self._cached_domain = lru_cache(maxsize=self.DOMAIN_CACHE_SIZE)(
+            self._extract_domain
+        )
 
     def normalize(self, url: str) -> NormalizedURL:
         """
@@ -106,7 +128,7 @@ class URLNormalizer:
         query = self._normalize_query(parsed.query)
 
         # Extract eTLD+1 domain
-        domain = self._extract_domain(host)
+        domain = self._cached_domain(host)
 
         return NormalizedURL(
             scheme=scheme,
@@ -140,6 +162,11 @@ class URLNormalizer:
         # Lowercase
         host = host.lower()
 
+        # ASCII hosts (including already-punycoded ones) come back unchanged
+        # from the idna codec, so skip it
+        if host.isascii():
+            return host
+
         # Convert to punycode (idna encoding) if needed
         try:
             # This handles internationalized domain names
@@ -14,7 +14,7 @@ from fastapi.testclient import TestClient
 from dataset_db.api import QueryService, init_loader
 from dataset_db.api.loader import IndexLoader
 from dataset_db.index import IndexBuilder
-from dataset_db.ingestion import IngestionProcessor
+from dataset_db.ingestion import DatasetRegistry, IngestionProcessor
 from dataset_db.storage import ParquetWriter
 
 
@@ -25,7 +25,9 @@ def test_data_path():
         base_path = Path(tmpdir)
 
         # Create test data
-        processor = IngestionProcessor()
+        processor = IngestionProcessor(
+            dataset_registry=DatasetRegistry(base_path=base_path)
+        )
         writer = ParquetWriter(base_path=base_path)
 
         # Add some test URLs from different domains
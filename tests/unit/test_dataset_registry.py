@@ -1,5 +1,7 @@
 """Tests for the persistent DatasetRegistry."""
 
+import json
+
 from dataset_db.ingestion.dataset_registry import DatasetRegistry
 
 
@@ -37,3 +39,43 @@ def test_to_dict_returns_copy(tmp_path):
 
     # Internal state should be unchanged
     assert registry.get_dataset_id("dataset_one") == 0
+
+
+def test_registry_appends_one_line_per_dataset(tmp_path):
+    registry = DatasetRegistry(base_path=tmp_path)
+    registry.register_dataset("dataset_one")
+    registry.register_dataset("dataset_two")
+    registry.register_dataset("dataset_one")
+
+    lines = registry.registry_path.read_text().splitlines()
+    assert len(lines) == 2
+
+
+def test_registry_skips_partial_trailing_line(tmp_path):
+    registry = DatasetRegistry(base_path=tmp_path)
+    registry.register_dataset("dataset_one")
+    with registry.registry_path.open("a") as f:
+        f.write('{"n": "dataset_tw')
+
+    registry2 = DatasetRegistry(base_path=tmp_path)
+    assert registry2.to_dict() == {"dataset_one": 0}
+    assert registry2.register_dataset("dataset_two") == 1
+
+    registry3 = DatasetRegistry(base_path=tmp_path)
+    assert registry3.to_dict() == {"dataset_one": 0, "dataset_two": 1}
+
+
+def test_registry_reads_legacy_json(tmp_path):
+    legacy_path = tmp_path / "registry" / "dataset_registry.json"
+    legacy_path.parent.mkdir(parents=True)
+    legacy_path.write_text(
+        json.dumps({"next_dataset_id": 2, "datasets": {"a": 0, "b": 1}}, indent=2)
+    )
+
+    registry = DatasetRegistry(base_path=tmp_path)
+
+    assert registry.to_dict() == {"a": 0, "b": 1}
+    assert not legacy_path.exists()
+    assert legacy_path.with_suffix(".json.bak").exists()
+    assert registry.register_dataset("c") == 2
+    assert DatasetRegistry(base_path=tmp_path).get_dataset_id("c") == 2
@@ -80,7 +80,7 @@ def test_write_and_read_domain_dict(temp_data_path):
     # Write
     output_path = domain_dict.write_domain_dict(test_domains, version)
     assert output_path.exists()
-    assert output_path.name == "domains.txt.zst"
+    assert output_path.name == "domains.arrow"
 
     # Read back
     loaded_domains = domain_dict.read_domain_dict(version)
@@ -180,3 +180,42 @@ def test_read_nonexistent_version(temp_data_path):
 
     with pytest.raises(FileNotFoundError):
         domain_dict.read_domain_dict("nonexistent")
+
+
+def test_read_legacy_text_domain_dict(temp_data_path):
+    """Test that versions written in the newline-delimited format still load."""
+    import zstandard as zstd
+
+    domain_dict = DomainDictionary(temp_data_path)
+    version = "2024-01-01T00:00:00Z"
+
+    legacy_path = temp_data_path / "index" / version / "domains.txt.zst"
+    legacy_path.parent.mkdir(parents=True)
+    legacy_path.write_bytes(zstd.ZstdCompressor().compress(b"alpha.com\nbeta.com\n"))
+
+    assert domain_dict.read_domain_dict(version) == ["alpha.com", "beta.com"]
+
+
+def test_build_incremental_with_old_domains(temp_data_path):
+    """Test passed-in old domains are used instead of re-reading the dictionary."""
+    domain_dict = DomainDictionary(temp_data_path)
+    domain_dict.write_domain_dict(["stale.com"], "v1")
+
+    domain_dict.build_incremental(
+        version="v2",
+        prev_version="v1",
+        new_files=[],
+        old_domains=["beta.com", "alpha.com"],
+    )
+
+    assert domain_dict.read_domain_dict("v2") == ["beta.com", "alpha.com"]
+
+
+def test_extract_unique_domains_merges_buffers(sample_parquet_data, monkeypatch):
+    """Test that intermediate Polars merges produce the same result."""
+    domain_dict = DomainDictionary(sample_parquet_data)
+    monkeypatch.setattr(DomainDictionary, "MERGE_MIN_ROWS", 1)
+
+    domains = domain_dict.extract_unique_domains()
+
+    assert domains == ["another.com", "demo.org", "example.com", "test.com"]
@@ -1,8 +1,11 @@
 """Tests for file registry."""
 
 
+import os
+
 import polars as pl
 import pytest
+import zstandard as zstd
 
 from dataset_db.index import FileRegistry
 from dataset_db.storage import ParquetWriter
@@ -182,3 +185,119 @@ def test_compression_ratio(sample_parquet_files):
 
     # Should be less than 5KB for 3 files
     assert file_size < 5000
+
+
+def test_scan_skips_unpartitioned_files(sample_parquet_files, caplog):
+    """Test that files outside dataset_id=/domain_prefix= dirs are skipped."""
+    stray = sample_parquet_files / "urls" / "dataset_id=x" / "stray.parquet"
+    stray.parent.mkdir(parents=True)
+    stray.write_bytes(b"")
+
+    registry = FileRegistry(sample_parquet_files)
+    registry.scan_parquet_files()
+
+    assert len(registry.files) == 3
+    assert {info["dataset_id"] for info in registry.files} == {0, 1}
+    assert {info["domain_prefix"] for info in registry.files} == {"aa", "bb", "cc"}
+    assert "Skipped 1 Parquet files" in caplog.text
+
+
+def test_save_and_load_numeric_prefixes(temp_data_path):
+    """Test that hex prefixes which look numeric survive a TSV round trip."""
+    writer = ParquetWriter(base_path=temp_data_path)
+    df = pl.DataFrame(
+        {
+            "domain_id": [1],
+            "url_id": [100],
+            "scheme": ["https"],
+            "host": ["example.com"],
+            "path_query": ["/"],
+            "domain": ["example.com"],
+        }
+    )
+    writer._write_partition(df, dataset_id=0, domain_prefix="00")
+    writer._write_partition(df, dataset_id=0, domain_prefix="1e")
+
+    registry = FileRegistry(temp_data_path)
+    registry.scan_parquet_files()
+    output_path = temp_data_path / "index" / "v1" / "files.tsv.zst"
+    registry.save(output_path)
+
+    loaded = FileRegistry(temp_data_path)
+    loaded.load(output_path)
+
+    assert loaded.domain_prefixes == ["00", "1e"]
+    assert loaded.get_file_info(1) == registry.get_file_info(1)
+    assert loaded.files == registry.files
+
+
+def test_load_paths_only(sample_parquet_files):
+    """Test loading just the relative paths from a saved registry."""
+    registry = FileRegistry(sample_parquet_files)
+    registry.scan_parquet_files()
+    output_path = sample_parquet_files / "index" / "v1" / "files.tsv.zst"
+    registry.save(output_path)
+
+    paths = FileRegistry.load_paths_only(output_path)
+
+    assert paths == set(registry.parquet_rel_paths)
+    assert registry.get_new_files_since_version(output_path) == []
+
+
+def test_load_sized_frame(temp_data_path):
+    """Test loading a registry compressed in one shot (content size in frame)."""
+    tsv = (
+        "file_id\tdataset_id\tdomain_prefix\tparquet_rel_path\n"
+        "0\t1\t0a\tdataset_id=1/domain_prefix=0a/part-00000.parquet\n"
+    )
+    registry_path = temp_data_path / "files.tsv.zst"
+    registry_path.parent.mkdir(parents=True)
+    registry_path.write_bytes(zstd.ZstdCompressor().compress(tsv.encode("utf-8")))
+
+    registry = FileRegistry(temp_data_path)
+    registry.load(registry_path)
+
+    assert registry.get_file_info(0) == {
+        "file_id": 0,
+        "dataset_id": 1,
+        "domain_prefix": "0a",
+        "parquet_rel_path": "dataset_id=1/domain_prefix=0a/part-00000.parquet",
+    }
+
+
+def test_build_incremental_skips_unchanged_partitions(sample_parquet_files, caplog):
+    """Test that partitions unchanged since the last registry are not re-listed."""
+    urls_dir = sample_parquet_files / "urls"
+    partition_dirs = sorted(urls_dir.glob("dataset_id=*/domain_prefix=*"))
+    for partition_dir in partition_dirs:
+        os.utime(partition_dir, ns=(10**18, 10**18))
+
+    registry = FileRegistry(sample_parquet_files)
+    prev_path = registry.build("v1", sample_parquet_files)
+    assert (prev_path.parent / FileRegistry.DIR_MTIMES_FILENAME).exists()
+    assert len(registry.dir_mtimes) == 3
+
+    # Add a file to one partition; its directory mtime changes
+    writer = ParquetWriter(base_path=sample_parquet_files)
+    df = pl.DataFrame(
+        {
+            "domain_id": [4],
+            "url_id": [400],
+            "scheme": ["https"],
+            "host": ["new.com"],
+            "path_query": ["/"],
+            "domain": ["new.com"],
+        }
+    )
+    writer._write_partition(df, dataset_id=0, domain_prefix="aa")
+
+    new_files = registry.get_new_files_since_version(prev_path)
+    assert [path.parent.name for path in new_files] == ["domain_prefix=aa"]
+
+    caplog.set_level("INFO")
+    incremental = FileRegistry(sample_parquet_files)
+    incremental.build_incremental("v2", sample_parquet_files, prev_path)
+
+    assert "Skipped 2 unchanged partition directories" in caplog.text
+    assert len(incremental) == 4
+    assert incremental.file_ids.tolist() == [0, 1, 2, 3]
@@ -0,0 +1,71 @@
+"""Tests for HuggingFace dataset loader."""
+
+import json
+
+import datasets
+import pytest
+
+from dataset_db.config import reset_config
+from dataset_db.ingestion import HuggingFaceLoader
+
+
+def make_dataset():
+    """Create a small local streaming dataset."""
+    return datasets.Dataset.from_dict(
+        {
+            "url": [f"https://example.com/{i}" for i in range(10)],
+            "domain": ["example.com"] * 10,
+        }
+    ).to_iterable_dataset(num_shards=2)
+
+
+@pytest.fixture
+def loader(tmp_path, monkeypatch):
+    """Create a loader reading the local dataset, with state under tmp_path."""
+    monkeypatch.setenv("STORAGE_BASE_PATH", str(tmp_path))
+    reset_config()
+    monkeypatch.setattr(
+        "dataset_db.ingestion.hf_loader.load_dataset",
+        lambda *args, **kwargs: make_dataset(),
+    )
+    yield HuggingFaceLoader(batch_size=4)
+    reset_config()
+
+
+def urls(df):
+    """Get the URL suffixes of a batch."""
+    return [url.rsplit("/", 1)[1] for url in df["url"].to_list()]
+
+
+def test_load_streams_batches(loader):
+    """Test batches keep the input schema and order."""
+    batches = list(loader.load("local", resume=False))
+
+    assert [len(df) for df in batches] == [4, 4, 2]
+    assert batches[0].columns == ["url", "domain"]
+    loader.validate_schema(batches[0])
+    assert urls(batches[2]) == ["8", "9"]
+
+
+def test_load_resumes_from_saved_state(loader):
+    """Test resuming continues after the last saved batch."""
+    for df in loader.load("local"):
+        loader.save_state_dict("local")
+        break
+
+    resumed = list(HuggingFaceLoader(batch_size=4).load("local"))
+
+    assert [urls(df) for df in resumed] == [["4", "5", "6", "7"], ["8", "9"]]
+
+
+def test_load_resumes_from_record_level_state(loader):
+    """Test state dicts saved by record-by-record iteration still resume."""
+    dataset = make_dataset()
+    records = iter(dataset)
+    for _ in range(6):
+        next(records)
+    loader.get_state_dict_path("local").write_text(json.dumps(dataset.state_dict()))
+
+    resumed = list(loader.load("local"))
+
+    assert [urls(df) for df in resumed] == [["6", "7", "8", "9"]]
@@ -88,6 +88,23 @@ class TestIDGenerator:
 
         assert prefix1 == prefix2
 
+    def test_batch_ids_match_scalar(self, id_gen):
+        """Test batch ID generation matches the per-value methods."""
+        urls = [f"https://example{i}.com/path" for i in range(200)] + ["é.com"]
+        domains = [f"example{i}.com" for i in range(200)] + ["é.com"]
+
+        assert id_gen.get_url_ids(urls).tolist() == [
+            id_gen.get_url_id(url) for url in urls
+        ]
+        assert id_gen.get_domain_ids(domains).tolist() == [
+            id_gen.get_domain_id(domain) for domain in domains
+        ]
+        for prefix_chars in (1, 2, 4, 6):
+            assert id_gen.get_domain_prefixes(domains, prefix_chars) == [
+                id_gen.get_domain_prefix(domain, prefix_chars) for domain in domains
+            ]
+        assert id_gen.get_domain_prefixes([]) == []
+
     def test_dataset_registration(self, id_gen):
         """Test dataset registration."""
         dataset_id = id_gen.register_dataset("test_dataset")
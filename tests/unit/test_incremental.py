@@ -7,7 +7,7 @@ import polars as pl
 import pytest
 
 from dataset_db.index import IndexBuilder
-from dataset_db.ingestion import IngestionProcessor
+from dataset_db.ingestion import DatasetRegistry, IngestionProcessor
 from dataset_db.storage import ParquetWriter
 
 
@@ -47,7 +47,9 @@ def sample_urls_batch2():
 def test_incremental_file_registry(test_data_dir, sample_urls_batch1, sample_urls_batch2):
     """Test incremental file registry building."""
     # Ingest first batch
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     normalized1 = processor.process_batch(sample_urls_batch1, "dataset1")
@@ -82,7 +84,9 @@ def test_incremental_file_registry(test_data_dir, sample_urls_batch1, sample_url
 def test_incremental_domain_dict(test_data_dir, sample_urls_batch1, sample_urls_batch2):
     """Test incremental domain dictionary building."""
     # Ingest first batch
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     normalized1 = processor.process_batch(sample_urls_batch1, "dataset1")
@@ -125,7 +129,9 @@ def test_incremental_domain_dict(test_data_dir, sample_urls_batch1, sample_urls_
 def test_incremental_membership(test_data_dir, sample_urls_batch1, sample_urls_batch2):
     """Test incremental membership index building."""
     # Ingest first batch
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     normalized1 = processor.process_batch(sample_urls_batch1, "dataset1")
@@ -180,7 +186,9 @@ def test_incremental_membership(test_data_dir, sample_urls_batch1, sample_urls_b
 def test_incremental_no_new_files(test_data_dir, sample_urls_batch1):
     """Test incremental build when there are no new files."""
     # Ingest first batch
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     normalized1 = processor.process_batch(sample_urls_batch1, "dataset1")
@@ -201,7 +209,9 @@ def test_incremental_no_new_files(test_data_dir, sample_urls_batch1):
 def test_incremental_first_build(test_data_dir, sample_urls_batch1):
     """Test incremental build when there is no previous version."""
     # Ingest first batch
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     normalized1 = processor.process_batch(sample_urls_batch1, "dataset1")
@@ -229,7 +239,9 @@ def test_domain_id_stability(test_data_dir):
     existing domain IDs must not change. New domains should be appended
     to the end of the domain list.
     """
-    processor = IngestionProcessor()
+    processor = IngestionProcessor(
+        dataset_registry=DatasetRegistry(base_path=test_data_dir)
+    )
     writer = ParquetWriter(base_path=test_data_dir)
 
     # Phase 1: Initial build with domains that will sort in middle
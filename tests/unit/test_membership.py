@@ -0,0 +1,325 @@
+"""Tests for domain → datasets membership index."""
+
+import struct
+
+import polars as pl
+import pytest
+from pyroaring import BitMap
+
+from dataset_db.index import MembershipIndex
+
+
+@pytest.fixture
+def saved_index(tmp_path):
+    """Save a small membership index and return its path."""
+    membership = MembershipIndex(tmp_path)
+    membership.domain_bitmaps = {
+        0: BitMap([1, 2]),
+        1: BitMap([7]),
+        2: BitMap(range(0, 100_000, 3)),
+    }
+    index_path = tmp_path / "index" / "v1" / "domain_to_datasets.roar"
+    membership.save(index_path)
+    return index_path
+
+
+def test_save_and_load(saved_index):
+    """Test round trip through the binary format."""
+    membership = MembershipIndex(saved_index.parent)
+    membership.load(saved_index, num_domains=3)
+
+    assert len(membership.domain_bitmaps) == 3
+    assert membership.get_datasets(0) == [1, 2]
+    assert membership.get_dataset_count(2) == len(range(0, 100_000, 3))
+    assert membership.get_datasets(99) == []
+    assert membership.total_dataset_refs() == 3 + len(range(0, 100_000, 3))
+
+
+def test_resave_loaded_index_in_place(saved_index):
+    """Test that saving over the file backing a loaded index keeps it intact."""
+    membership = MembershipIndex(saved_index.parent)
+    membership.load(saved_index, num_domains=3)
+
+    membership.save(saved_index)
+
+    reloaded = MembershipIndex(saved_index.parent)
+    reloaded.load(saved_index, num_domains=3)
+    assert dict(reloaded.domain_bitmaps) == dict(membership.domain_bitmaps)
+
+
+def test_save_leaves_bitmaps_unchanged(tmp_path):
+    """Test that saving does not run-optimize the caller's bitmaps in place."""
+    bitmap = BitMap()
+    bitmap.update(list(range(1000)))
+    membership = MembershipIndex(tmp_path)
+    membership.domain_bitmaps = {0: bitmap}
+
+    membership.save(tmp_path / "index.roar")
+
+    assert bitmap.get_statistics()["n_run_containers"] == 0
+
+
+def test_load_empty_index(tmp_path):
+    """Test loading an index with no domains."""
+    index_path = tmp_path / "empty.roar"
+    MembershipIndex(tmp_path).save(index_path)
+
+    membership = MembershipIndex(tmp_path)
+    membership.load(index_path, num_domains=0)
+
+    assert len(membership.domain_bitmaps) == 0
+    assert membership.get_datasets(0) == []
+
+
+def test_merge_with_loaded_index(saved_index):
+    """Test merging new memberships into a lazily loaded index."""
+    membership = MembershipIndex(saved_index.parent)
+    membership.load(saved_index, num_domains=3)
+
+    merged = membership.merge_memberships(
+        membership.domain_bitmaps, {1: {8}, 3: {4, 5}}
+    )
+
+    assert list(merged[1]) == [7, 8]
+    assert list(merged[3]) == [4, 5]
+    assert list(merged[0]) == [1, 2]
+    assert membership.get_datasets(1) == [7]
+
+
+def test_extract_memberships_from_files(tmp_path, caplog):
+    """Test extraction maps domains to IDs and skips unknown domains."""
+    files = []
+    for dataset_id, domains in [(0, ["a.com", "b.com"]), (1, ["b.com", "zzz.com"])]:
+        part_dir = tmp_path / f"dataset_id={dataset_id}" / "domain_prefix=ab"
+        part_dir.mkdir(parents=True)
+        path = part_dir / "part-00000.parquet"
+        pl.DataFrame({"domain": domains}).write_parquet(path)
+        files.append(path)
+
+    membership = MembershipIndex(tmp_path)
+    with caplog.at_level("WARNING"):
+        memberships = membership.extract_memberships_from_files(
+            files, {"a.com": 0, "b.com": 1}
+        )
+
+    assert memberships == {0: {0}, 1: {0, 1}}
+    assert "1 domains not found in domain lookup" in caplog.text
+
+
+def test_merge_in_place(tmp_path):
+    """Test in-place merge reuses the caller's bitmaps and copy merge does not."""
+    membership = MembershipIndex(tmp_path)
+    old = {0: BitMap([1])}
+
+    copied = membership.merge_memberships(old, {0: {2}})
+    assert list(old[0]) == [1]
+    assert list(copied[0]) == [1, 2]
+
+    merged = membership.merge_memberships(old, {0: {3}, 1: {4}}, in_place=True)
+    assert merged is old
+    assert list(old[0]) == [1, 3]
+    assert list(old[1]) == [4]
+
+
+def test_save_rejects_sparse_domain_ids(tmp_path):
+    """Test that saving fails cleanly when domain IDs have gaps."""
+    membership = MembershipIndex(tmp_path)
+    membership.domain_bitmaps = {0: BitMap([1]), 2: BitMap([2])}
+    index_path = tmp_path / "sparse.roar"
+
+    with pytest.raises(ValueError, match="not dense"):
+        membership.save(index_path)
+
+    assert not index_path.exists()
+    assert not index_path.with_suffix(".tmp").exists()
+
+
+def test_extract_memberships_skips_unpartitioned_files(tmp_path):
+    """Test the per-file fallback parses dataset_id from the path."""
+    part_dir = tmp_path / "dataset_id=3" / "domain_prefix=ab"
+    part_dir.mkdir(parents=True)
+    partitioned = part_dir / "part-00000.parquet"
+    pl.DataFrame({"domain": ["a.com"]}).write_parquet(partitioned)
+    stray = tmp_path / "stray.parquet"
+    pl.DataFrame({"domain": ["a.com"]}).write_parquet(stray)
+
+    membership = MembershipIndex(tmp_path)
+    memberships = membership.extract_memberships_from_files(
+        [partitioned, stray], {"a.com": 0}
+    )
+
+    assert memberships == {0: {3}}
+
+
+def test_verify_rejects_corrupted_index(saved_index):
+    """Test that a flipped byte fails the opt-in checksum check."""
+    membership = MembershipIndex(saved_index.parent)
+    membership.verify(saved_index)
+
+    data = bytearray(saved_index.read_bytes())
+    data[30] ^= 0xFF
+    saved_index.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        membership.verify(saved_index)
+    with pytest.raises(ValueError, match="checksum mismatch"):
+        membership.load(saved_index, num_domains=3, verify=True)
+
+    # Plain load() stays lazy and skips the full-file pass
+    membership.load(saved_index, num_domains=3)
+    assert len(membership.domain_bitmaps) == 3
+
+
+def test_load_version_1_index(saved_index):
+    """Test that indexes written before the checksum trailer still load."""
+    data = bytearray(saved_index.read_bytes()[:-4])
+    struct.pack_into("<I", data, 4, 1)
+    saved_index.write_bytes(bytes(data))
+
+    membership = MembershipIndex(saved_index.parent)
+    membership.verify(saved_index)
+    membership.load(saved_index, num_domains=3)
+
+    assert membership.get_datasets(0) == [1, 2]
+    assert membership.get_datasets(1) == [7]
+
+
+def test_extract_memberships(tmp_path):
+    """Test building bitmaps from every Parquet file under urls/."""
+    for dataset_id, domains in [(0, ["a.com"]), (1, ["a.com", "b.com"])]:
+        part_dir = tmp_path / "urls" / f"dataset_id={dataset_id}" / "domain_prefix=ab"
+        part_dir.mkdir(parents=True)
+        pl.DataFrame({"domain": domains}).write_parquet(part_dir / "part-00000.parquet")
+
+    membership = MembershipIndex(tmp_path)
+    membership.extract_memberships({"a.com": 0, "b.com": 1})
+
+    assert membership.get_datasets(0) == [0, 1]
+    assert membership.get_datasets(1) == [1]
+
+
+def test_extract_and_save(tmp_path):
+    """Test streaming extraction matches extract_memberships() + save()."""
+    for dataset_id, domains in [(0, ["a.com", "c.com"]), (2, ["a.com"])]:
+        part_dir = tmp_path / "urls" / f"dataset_id={dataset_id}" / "domain_prefix=ab"
+        part_dir.mkdir(parents=True)
+        pl.DataFrame({"domain": domains}).write_parquet(part_dir / "part-00000.parquet")
+    # b.com is in the lookup but not in any file
+    domain_lookup = {"a.com": 0, "b.com": 1, "c.com": 2}
+    index_path = tmp_path / "index" / "v1" / "domain_to_datasets.roar"
+
+    membership = MembershipIndex(tmp_path)
+    membership.extract_and_save(domain_lookup, index_path)
+
+    assert len(membership.domain_bitmaps) == 3
+    assert membership.get_datasets(0) == [0, 2]
+    assert membership.get_datasets(1) == []
+    assert membership.get_datasets(2) == [0]
+    assert not index_path.with_suffix(".pairs.parquet").exists()
+
+    reloaded = MembershipIndex(tmp_path)
+    reloaded.load(index_path, num_domains=3)
+    assert dict(reloaded.domain_bitmaps) == dict(membership.domain_bitmaps)
+
+
+def test_extract_and_save_warns_on_unknown_domains(tmp_path, caplog):
+    """Test streaming extraction reports domains missing from the lookup."""
+    part_dir = tmp_path / "urls" / "dataset_id=0" / "domain_prefix=ab"
+    part_dir.mkdir(parents=True)
+    pl.DataFrame({"domain": ["a.com", "zzz.com", "yyy.com"]}).write_parquet(
+        part_dir / "part-00000.parquet"
+    )
+    index_path = tmp_path / "domain_to_datasets.roar"
+
+    membership = MembershipIndex(tmp_path)
+    with caplog.at_level("WARNING"):
+        membership.extract_and_save({"a.com": 0}, index_path)
+
+    assert "Streaming extraction failed" not in caplog.text
+    assert "2 domains not found in domain lookup" in caplog.text
+    assert membership.get_datasets(0) == [0]
+    assert len(membership.domain_bitmaps) == 1
+
+
+def test_extract_and_save_many_domains(tmp_path):
+    """Test streaming extraction when pairs span several record batches."""
+    domains = [f"d{i}.com" for i in range(30_000)]
+    for dataset_id in range(3):
+        part_dir = tmp_path / "urls" / f"dataset_id={dataset_id}" / "domain_prefix=ab"
+        part_dir.mkdir(parents=True)
+        pl.DataFrame({"domain": domains}).write_parquet(part_dir / "part-00000.parquet")
+    # Extra IDs at the end have no pairs
+    domain_lookup = {domain: i for i, domain in enumerate(domains + ["x.com"])}
+    index_path = tmp_path / "domain_to_datasets.roar"
+
+    membership = MembershipIndex(tmp_path)
+    membership.extract_and_save(domain_lookup, index_path)
+
+    assert len(membership.domain_bitmaps) == 30_001
+    assert membership.total_dataset_refs() == 90_000
+    assert membership.get_datasets(21_845) == [0, 1, 2]
+    assert membership.get_datasets(30_000) == []
+
+
+@pytest.mark.parametrize(
+    "domain_lookup", [{"b.com": 0, "a.com": 1}, {"a.com": 0, "b.com": 1}]
+)
+def test_extract_and_save_with_stray_file(tmp_path, domain_lookup):
+    """Test domains only seen in non-partitioned files get empty bitmaps."""
+    part_dir = tmp_path / "urls" / "dataset_id=0" / "domain_prefix=ab"
+    part_dir.mkdir(parents=True)
+    pl.DataFrame({"domain": ["a.com"]}).write_parquet(part_dir / "part-00000.parquet")
+    pl.DataFrame({"domain": ["b.com"]}).write_parquet(
+        tmp_path / "urls" / "stray.parquet"
+    )
+    index_path = tmp_path / "domain_to_datasets.roar"
+
+    membership = MembershipIndex(tmp_path)
+    membership.extract_and_save(domain_lookup, index_path)
+
+    # The in-memory fallback also leaves a lazy view of the saved file
+    assert membership.domain_bitmaps.counts is not None
+    assert len(membership.domain_bitmaps) == 2
+
+    reloaded = MembershipIndex(tmp_path)
+    reloaded.load(index_path, num_domains=2)
+    assert len(reloaded.domain_bitmaps) == 2
+    assert reloaded.get_datasets(domain_lookup["a.com"]) == [0]
+    assert reloaded.get_datasets(domain_lookup["b.com"]) == []
+
+
+def test_save_pads_missing_domain_ids(tmp_path):
+    """Test saving with num_domains fills gaps and rejects IDs out of range."""
+    membership = MembershipIndex(tmp_path)
+    membership.domain_bitmaps = {1: BitMap([2])}
+    index_path = tmp_path / "padded.roar"
+
+    membership.save(index_path, num_domains=3)
+
+    reloaded = MembershipIndex(tmp_path)
+    reloaded.load(index_path, num_domains=3)
+    assert [reloaded.get_datasets(i) for i in range(3)] == [[], [2], []]
+
+    with pytest.raises(ValueError, match="out of range"):
+        membership.save(index_path, num_domains=1)
+
+
+def test_dataset_counts_sidecar(saved_index):
+    """Test counts come from the sidecar, with a fallback to the bitmaps."""
+    counts_path = saved_index.with_suffix(".counts.npy")
+    assert counts_path.exists()
+
+    membership = MembershipIndex(saved_index.parent)
+    membership.load(saved_index, num_domains=3)
+    assert membership.domain_bitmaps.counts is not None
+    assert membership.get_dataset_count(0) == 2
+    assert membership.get_dataset_count(3) == 0
+    assert membership.total_dataset_refs() == 3 + len(range(0, 100_000, 3))
+
+    # Index files without a sidecar still report counts
+    counts_path.unlink()
+    legacy = MembershipIndex(saved_index.parent)
+    legacy.load(saved_index, num_domains=3)
+    assert legacy.domain_bitmaps.counts is None
+    assert legacy.get_dataset_count(1) == 1
+    assert legacy.get_dataset_count(-1) == 0
@@ -1,7 +1,11 @@
 """Tests for MPHF (Minimal Perfect Hash Function)."""
 
 
+import struct
+
 import pytest
+import xxhash
+import zstandard as zstd
 
 from dataset_db.index import SimpleMPHF
 
@@ -25,6 +29,17 @@ def test_build_and_lookup():
     assert mphf.lookup("cherry.com") == 2
 
 
+def test_lookup_many():
+    """Test batch lookup matches per-domain lookup."""
+    domains = [f"domain{i}.com" for i in range(1000)]
+    mphf = SimpleMPHF()
+    mphf.build(domains)
+
+    queries = ["domain7.com", "missing.com", "domain999.com", "domain0.com"]
+    assert mphf.lookup_many(queries).tolist() == [7, -1, 999, 0]
+    assert SimpleMPHF().lookup_many(queries).tolist() == [-1, -1, -1, -1]
+
+
 def test_lookup_nonexistent():
     """Test lookup of domain not in MPHF."""
     mphf = SimpleMPHF()
@@ -183,3 +198,72 @@ def test_build_from_dict(temp_path):
     assert mphf.lookup("a.com") == 0
     assert mphf.lookup("b.com") == 1
     assert mphf.lookup("c.com") == 2
+
+
+def test_extend_loaded_mphf(temp_path):
+    """Test extending a saved MPHF with appended domains."""
+    old_domains = ["middle1.com", "middle2.com"]
+    mphf = SimpleMPHF()
+    mphf.build(old_domains)
+    save_path = temp_path / "old.mphf"
+    mphf.save(save_path)
+
+    new_domains = old_domains + ["aaa-before.com", "zzz-after.com"]
+    extended = SimpleMPHF()
+    extended.load(save_path)
+    extended.extend(new_domains, start_id=len(old_domains))
+
+    for domain_id, domain in enumerate(new_domains):
+        assert extended.lookup(domain) == domain_id
+    assert extended.lookup("missing.com") is None
+
+
+def test_forced_hash_collisions(temp_path, monkeypatch):
+    """Test domains sharing a 64-bit hash are resolved by domain string."""
+    # Hash by length, so same-length domains collide
+    monkeypatch.setattr(
+        "dataset_db.index.mphf.xxhash.xxh3_64_intdigest", lambda data: len(data)
+    )
+    domains = ["a.com", "b.com", "long.com"]
+    mphf = SimpleMPHF()
+    mphf.build(domains)
+    mphf.extend(domains + ["c.com", "other.org"], start_id=3)
+
+    save_path = temp_path / "collisions.mphf"
+    mphf.save(save_path)
+    loaded = SimpleMPHF()
+    loaded.load(save_path)
+
+    for candidate in (mphf, loaded):
+        assert candidate.lookup("a.com") == 0
+        assert candidate.lookup("b.com") == 1
+        assert candidate.lookup("c.com") == 3
+        assert candidate.lookup("long.com") == 2
+        assert candidate.lookup("other.org") == 4
+        assert candidate.lookup("d.com") is None
+        ids = candidate.lookup_many(["b.com", "d.com", "other.org"])
+        assert ids.tolist() == [1, -1, 4]
+
+
+def test_load_version_1_file(temp_path):
+    """Test loading the original interleaved hash map format."""
+    domains = ["a.com", "b.com"]
+    hashes = sorted(
+        (xxhash.xxh3_64_intdigest(domain.encode("utf-8")), domain_id)
+        for domain_id, domain in enumerate(domains)
+    )
+    data = b"MPHF" + struct.pack("<IQI", 1, len(hashes) + 1, 1)
+    for hash_val, domain_id in hashes:
+        data += struct.pack("<QI", hash_val, domain_id)
+    # One collision entry: (tag, domain_len, domain, id)
+    data += struct.pack("<QH", 7, 1)
+    data += struct.pack("<HH", 0, len("c.com")) + b"c.com" + struct.pack("<I", 2)
+    save_path = temp_path / "v1.mphf"
+    save_path.write_bytes(zstd.ZstdCompressor().compress(data))
+
+    mphf = SimpleMPHF()
+    mphf.load(save_path)
+
+    assert mphf.lookup("a.com") == 0
+    assert mphf.lookup("b.com") == 1
+    assert mphf.collision_map == {7: [("c.com", 2)]}
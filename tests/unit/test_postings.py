@@ -0,0 +1,103 @@
+"""Tests for postings index."""
+
+import numpy as np
+import polars as pl
+
+from dataset_db.index.postings import (
+    PostingsIndex,
+    decode_varint,
+    decode_varints,
+    encode_varint,
+    encode_varints,
+)
+
+
+def test_save_and_load_shard(tmp_path):
+    """Test round trip of postings through the sharded idx/dat files."""
+    postings = PostingsIndex(tmp_path, num_shards=2)
+    postings.postings = {
+        (0, 1): [(10, 0), (10, 1)],
+        (2, 3): [(11, 0)],
+        (1, 1): [(300, 2)],
+    }
+
+    saved = postings.save("v1")
+
+    assert len(saved) == 2
+    assert postings.lookup("v1", 0, 1) == [(10, 0), (10, 1)]
+    assert postings.lookup("v1", 2, 3) == [(11, 0)]
+    assert postings.lookup("v1", 1, 1) == [(300, 2)]
+    assert postings.lookup("v1", 2, 1) == []
+    assert postings.load_all_shards("v1") == postings.postings
+
+
+def test_lookup_after_resave(tmp_path):
+    """Test cached shards are dropped when a version is saved again."""
+    postings = PostingsIndex(tmp_path, num_shards=1)
+    postings.postings = {(5, 0): [(1, 0)], (5, 2): [(2, 0)], (6, 0): [(3, 1)]}
+    postings.save("v1")
+
+    assert postings.lookup("v1", 5, 2) == [(2, 0)]
+    assert postings.lookup("v1", 5, 1) == []
+    assert postings.lookup("v2", 5, 0) == []
+
+    postings.postings = {(5, 1): [(4, 2)]}
+    postings.save("v1")
+
+    assert postings.lookup("v1", 5, 1) == [(4, 2)]
+    assert postings.lookup("v1", 5, 2) == []
+
+
+def test_bulk_varints_match_scalar_encoding():
+    """Test vectorized varint coding against the per-integer functions."""
+    values = [0, 1, 127, 128, 300, 16_383, 16_384, 2**32 + 5, 2**63 - 1]
+
+    encoded, nbytes = encode_varints(np.array(values, dtype=np.uint64))
+
+    assert encoded.tobytes() == b"".join(encode_varint(value) for value in values)
+    assert nbytes.tolist() == [len(encode_varint(value)) for value in values]
+
+    decoded, offsets = decode_varints(encoded.tobytes())
+    assert decoded.tolist() == values
+    assert offsets.tolist() == [0, *np.cumsum(nbytes)[:-1].tolist()]
+    assert decode_varint(encoded.tobytes(), int(offsets[4])) == (300, int(offsets[5]))
+
+
+def test_extract_postings(tmp_path):
+    """Test extraction of row-group postings from partitioned files."""
+    part_dir = tmp_path / "urls" / "dataset_id=4" / "domain_prefix=ab"
+    part_dir.mkdir(parents=True)
+    pl.DataFrame({"domain": ["a.com", "a.com", "b.com"]}).write_parquet(
+        part_dir / "part-00000.parquet"
+    )
+    pl.DataFrame({"domain": ["b.com"]}).write_parquet(part_dir / "part-00001.parquet")
+    # Not in the registry, so skipped
+    pl.DataFrame({"domain": ["a.com"]}).write_parquet(part_dir / "part-00002.parquet")
+    file_registry = {
+        "dataset_id=4/domain_prefix=ab/part-00000.parquet": 0,
+        "dataset_id=4/domain_prefix=ab/part-00001.parquet": 1,
+    }
+
+    postings = PostingsIndex(tmp_path)
+    postings.extract_postings({"a.com": 0, "b.com": 1}, file_registry)
+
+    assert postings.postings == {(0, 4): [(0, 0)], (1, 4): [(0, 0), (1, 0)]}
+
+
+def test_extract_postings_per_row_group(tmp_path):
+    """Test that each row group only lists the domains it contains."""
+    part_dir = tmp_path / "urls" / "dataset_id=2" / "domain_prefix=ab"
+    part_dir.mkdir(parents=True)
+    pl.DataFrame({"domain": ["a.com", "a.com", "b.com", "c.com"]}).write_parquet(
+        part_dir / "part-00000.parquet", row_group_size=2
+    )
+    file_registry = {"dataset_id=2/domain_prefix=ab/part-00000.parquet": 7}
+
+    postings = PostingsIndex(tmp_path)
+    postings.extract_postings({"a.com": 0, "b.com": 1, "c.com": 2}, file_registry)
+
+    assert postings.postings == {
+        (0, 2): [(7, 0)],
+        (1, 2): [(7, 1)],
+        (2, 2): [(7, 1)],
+    }
@@ -3,7 +3,7 @@
 import polars as pl
 import pytest
 
-from dataset_db.ingestion import IngestionProcessor
+from dataset_db.ingestion import DatasetRegistry, IngestionProcessor
 from dataset_db.normalization import IDGenerator, URLNormalizer
 
 
@@ -18,6 +18,7 @@ class TestIngestionProcessor:
         return IngestionProcessor(
             normalizer=normalizer,
             id_generator=id_gen,
+            dataset_registry=DatasetRegistry(base_path=tmp_path),
         )
 
     def test_process_batch_basic(self, processor):
@@ -135,6 +136,14 @@ class TestIngestionProcessor:
         assert "example.com" in result["domain"][0]
         assert "example.org" in result["domain"][1]
 
+    def test_process_batch_null_urls(self, processor):
+        """Test null URLs are skipped."""
+        input_df = pl.DataFrame({"url": [None, "https://example.com/valid", None]})
+
+        result = processor.process_batch(input_df, "test_dataset")
+
+        assert result["domain"].to_list() == ["example.com"]
+
     def test_process_batch_invalid_urls(self, processor):
         """Test invalid URLs are skipped with warning."""
         input_df = pl.DataFrame({
@@ -151,6 +160,42 @@ class TestIngestionProcessor:
         # Should have at least the valid URLs
         assert len(result) >= 2
 
+    def test_process_batch_worker_pool(self, processor, monkeypatch):
+        """Test normalizing on worker processes matches in-process results."""
+        urls = [
+            f"https://Sub{i}.Example{i % 7}.co.uk/a/../b?z={i}&a=1" for i in range(200)
+        ]
+        urls[10] = ""
+        urls[20] = "not a url"
+        input_df = pl.DataFrame({"url": urls})
+
+        monkeypatch.setattr(processor.config.ingestion, "max_workers", 2)
+        monkeypatch.setattr(IngestionProcessor, "MIN_PARALLEL_URLS", 1)
+        with processor:
+            parallel = processor.process_batch(input_df, "test_dataset")
+
+        monkeypatch.setattr(IngestionProcessor, "MIN_PARALLEL_URLS", 10**9)
+        serial = processor.process_batch(input_df, "test_dataset")
+
+        assert len(serial) == 198
+        assert parallel.equals(serial)
+
+    def test_process_batch_default_config_in_process(self, processor, monkeypatch):
+        """Test the worker pool is opt-in: default config never starts one."""
+
+        def fail(*args, **kwargs):
+            raise AssertionError("worker pool started")
+
+        monkeypatch.setattr("dataset_db.ingestion.processor.ProcessPoolExecutor", fail)
+        monkeypatch.setattr(IngestionProcessor, "MIN_PARALLEL_URLS", 1)
+        input_df = pl.DataFrame({"url": ["https://example.com/a"] * 10})
+
+        with processor:
+            result = processor.process_batch(input_df, "test_dataset")
+
+        assert processor.config.ingestion.max_workers == 1
+        assert len(result) == 10
+
     def test_reconstruct_url(self, processor):
         """Test URL reconstruction from components."""
         url = "https://example.com/path?a=1"
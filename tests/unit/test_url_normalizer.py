@@ -1,5 +1,7 @@
 """Unit tests for URL normalization."""
 
+import pickle
+
 import pytest
 
 from dataset_db.normalization import NormalizedURL, URLNormalizer
@@ -110,6 +112,12 @@ class TestURLNormalizer:
         assert result.host.startswith("xn--")
         assert result.host.endswith(".example.com")
 
+        # Already-punycoded and invalid ASCII hosts are kept as-is
+        result = normalizer.normalize("https://XN--fiqs8s.example.com/path")
+        assert result.host == "xn--fiqs8s.example.com"
+        result = normalizer.normalize("https://a..b.com/path")
+        assert result.host == "a..b.com"
+
     def test_to_url(self, normalizer):
         """Test reconstructing normalized URL."""
         result = normalizer.normalize(
@@ -156,6 +164,16 @@ class TestURLNormalizer:
         assert "utm_source=other" in result.query
         assert result.domain == "example.com"
 
+    def test_pickle_round_trip(self, normalizer):
+        """Test a pickled normalizer (as sent to ingestion workers) still works."""
+        normalizer.normalize("https://www.example.co.uk/a")
+
+        restored = pickle.loads(pickle.dumps(normalizer))
+
+        assert restored.normalize("https://blog.example.co.uk/b").domain == (
+            "example.co.uk"
+        )
+
 
 class TestNormalizedURL:
     """Test NormalizedURL dataclass."""